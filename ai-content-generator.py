@@ -4,21 +4,79 @@ AI Content Generator for TechReview Hub
 Automatically generates product reviews and blog articles using OpenAI API
 """
 
-import openai
+import asyncio
+import atexit
 import json
 import os
-import re
+import sys
+import time
 from datetime import datetime
-from typing import Dict, List
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+from content_parser import SectionParser, calculate_rating, parse_json_reviews, parse_sections
+from llm_backends import FakeLLMBackend, LLMResponse, OpenAIBackend, estimate_tokens
+from llm_cache import DEFAULT_CACHE_PATH, ResponseCache, cache_key
+from llm_metrics import LLMMetrics, MeteredBackend
+from rate_limiter import RateLimitedBackend, RateLimiter, get_shared_limiter
+from output_writer import OutputWriter
+from site_builder import CONTENT_DIR, MANIFEST_FILE, BuildManifest, save_page_source
+from template_engine import (BLOG_SLOTS, BLOG_TEMPLATE, REVIEW_SLOTS, REVIEW_TEMPLATE, TemplateCache,
+                             blog_values, review_values)
+
+REVIEW_SYSTEM_MESSAGE = "You are a professional tech reviewer with expertise in smart home devices and consumer electronics. Write detailed, honest, and helpful product reviews."
+ARTICLE_SYSTEM_MESSAGE = "You are a tech industry expert and content creator specializing in smart home technology and consumer electronics trends."
+
+
+def review_filename(product_data: Dict) -> str:
+    """Output filename for a product review page"""
+    return f"review-{product_data['name'].lower().replace(' ', '-').replace('(', '').replace(')', '')}.html"
+
+
+def blog_filename(topic: str) -> str:
+    """Output filename for a blog article page"""
+    return f"blog-{topic.lower().replace(' ', '-').replace(':', '').replace('?', '')}.html"
+
 
 class TechReviewAI:
-    def __init__(self, api_key: str):
-        """Initialize the AI content generator with OpenAI API key"""
-        openai.api_key = api_key
+    def __init__(self, api_key: str, backend=None, cache: Optional[ResponseCache] = None, use_cache: bool = True,
+                 metrics: Optional[LLMMetrics] = None, limiter: Optional[RateLimiter] = None,
+                 content_dir: Optional[str] = CONTENT_DIR, output_dir: str = "."):
+        """Initialize the AI content generator with OpenAI API key
+
+        Pass ``backend`` (e.g. ``FakeLLMBackend``) to generate without the OpenAI API.
+        Completions are cached on disk unless ``use_cache`` is False. Calls wait for
+        ``limiter`` (the process-wide limiter by default), retry transient errors
+        and are recorded in ``metrics``. The inputs of every rendered page are kept
+        in ``content_dir`` (None to disable) so site_builder can rebuild it, and
+        save_content records each written page in the build manifest.
+        Pages, page sources, the manifest and the response cache live under
+        ``output_dir``, which several worker machines may share. Pages go
+        through ``self.writer``; open ``self.writer.batch()`` around a run of
+        pages to sync them together. Page sources are written straight away
+        since the homepage cards read them and a page needs its source to be
+        rebuilt.
+        """
+        self.output_dir = output_dir
+        self.writer = OutputWriter()
+        self.content_dir = os.path.join(output_dir, content_dir) if content_dir else None
+        self._page_sources = {}
+        self.manifest = BuildManifest(os.path.join(output_dir, MANIFEST_FILE)) if content_dir else None
+        if self.manifest:
+            atexit.register(self.manifest.save)
+        self.metrics = metrics or LLMMetrics()
+        self.backend = MeteredBackend(
+            RateLimitedBackend(backend or OpenAIBackend(api_key), limiter or get_shared_limiter()),
+            self.metrics
+        )
+        self.cache = (cache or ResponseCache(os.path.join(output_dir, DEFAULT_CACHE_PATH))) if use_cache else None
+        self.model = "gpt-4"
         self.base_template_path = "."
+        self.templates = TemplateCache(self.base_template_path)
+        self.last_stream_stats = {}
+        self.batch_stats = {"pages": 0, "requests": 0, "fallbacks": 0, "prompt_tokens": 0, "single_prompt_tokens": 0}
         
-    def generate_product_review(self, product_data: Dict) -> str:
-        """Generate a complete product review HTML page"""
+    def _review_request(self, product_data: Dict) -> Dict:
+        """Build the chat completion request for a product review"""
         
         prompt = f"""
         Create a comprehensive product review for {product_data['name']}.
@@ -43,26 +101,60 @@ class TechReviewAI:
         Include specific technical details and real-world usage scenarios.
         """
         
-        try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a professional tech reviewer with expertise in smart home devices and consumer electronics. Write detailed, honest, and helpful product reviews."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=2500,
-                temperature=0.7
-            )
-            
-            content = response.choices[0].message.content
-            return self._create_review_html(product_data, content)
-            
-        except Exception as e:
-            print(f"Error generating review: {e}")
-            return None
+        return {
+            "messages": [
+                {"role": "system", "content": REVIEW_SYSTEM_MESSAGE},
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": 2500,
+            "temperature": 0.7
+        }
     
-    def generate_blog_article(self, topic: str, keywords: List[str]) -> str:
-        """Generate a comprehensive blog article"""
+    def _batched_review_request(self, products: List[Dict]) -> Dict:
+        """Build one chat completion request covering several products, answered as JSON"""
+        
+        product_blocks = "\n".join(
+            f"""
+        ### Product {i + 1}: {product['name']}
+        - Category: {product['category']}
+        - Price: ${product['price']}
+        - Key Features: {', '.join(product['features'])}
+        - Brand: {product['brand']}"""
+            for i, product in enumerate(products)
+        )
+        
+        prompt = f"""
+        Create a comprehensive product review for each of the {len(products)} products below.
+        {product_blocks}
+        
+        For every product write:
+        1. Introduction paragraph
+        2. Design and build quality section
+        3. Performance and features section
+        4. Pros and cons (6 pros, 5 cons)
+        5. Final verdict with rating out of 5
+        6. Value assessment
+        
+        Make it SEO-optimized, engaging, and include natural affiliate marketing elements.
+        Write in a professional but approachable tone.
+        Include specific technical details and real-world usage scenarios.
+        
+        Respond with only a JSON array containing one object per product, in the order above, with keys:
+        "name", "introduction", "design", "performance", "pros" (list of strings),
+        "cons" (list of strings), "verdict", "rating" (number out of 5), "value".
+        """
+        
+        return {
+            "messages": [
+                {"role": "system", "content": REVIEW_SYSTEM_MESSAGE},
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": min(1500 * len(products), 7000),
+            "temperature": 0.7
+        }
+    
+    def _article_request(self, topic: str, keywords: List[str]) -> Dict:
+        """Build the chat completion request for a blog article"""
         
         prompt = f"""
         Write a comprehensive blog article about "{topic}".
@@ -82,150 +174,428 @@ class TechReviewAI:
         Include statistics, trends, and future predictions where relevant.
         """
         
-        try:
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a tech industry expert and content creator specializing in smart home technology and consumer electronics trends."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=3500,
-                temperature=0.7
+        return {
+            "messages": [
+                {"role": "system", "content": ARTICLE_SYSTEM_MESSAGE},
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": 3500,
+            "temperature": 0.7
+        }
+    
+    def _cache_lookup(self, request: Dict) -> Tuple[Optional[str], Optional[LLMResponse]]:
+        """Return (key, cached response) for a request; the response is None on a miss"""
+        if not self.cache:
+            return None, None
+        key = cache_key(self.model, request["messages"], request["temperature"], request["max_tokens"])
+        entry = self.cache.get(key)
+        if not entry:
+            return key, None
+        return key, LLMResponse(entry["content"], entry["prompt_tokens"], entry["completion_tokens"])
+    
+    def _cache_store(self, key: Optional[str], response: LLMResponse):
+        if self.cache and key:
+            self.cache.put(key, response.content, response.prompt_tokens, response.completion_tokens)
+    
+    def _complete_response(self, request: Dict) -> LLMResponse:
+        """Run a chat completion request and return the text with its token usage"""
+        key, cached = self._cache_lookup(request)
+        if cached is not None:
+            return cached
+        
+        response = self.backend.complete(
+            self.model, request["messages"], request["max_tokens"], request["temperature"]
+        )
+        self._cache_store(key, response)
+        return response
+    
+    def _complete(self, request: Dict) -> str:
+        """Run a chat completion request and return the generated text"""
+        return self._complete_response(request).content
+    
+    async def _acomplete(self, request: Dict) -> str:
+        """Run a chat completion request without blocking the event loop"""
+        key, cached = self._cache_lookup(request)
+        if cached is not None:
+            return cached.content
+        
+        response = await self.backend.acomplete(
+            self.model, request["messages"], request["max_tokens"], request["temperature"]
+        )
+        self._cache_store(key, response)
+        return response.content
+    
+    def _stream(self, request: Dict) -> Iterator[str]:
+        """Yield completion text as it arrives, recording time-to-first-token in last_stream_stats"""
+        start = time.perf_counter()
+        stats = {"time_to_first_token": None, "total_time": None, "chunks": 0, "characters": 0, "cached": False}
+        self.last_stream_stats = stats
+        
+        key, cached = self._cache_lookup(request)
+        if cached is not None:
+            chunks = iter([cached.content])
+            stats["cached"] = True
+        else:
+            chunks = self.backend.stream(
+                self.model, request["messages"], request["max_tokens"], request["temperature"]
             )
+        
+        received = []
+        for chunk in chunks:
+            if stats["time_to_first_token"] is None:
+                stats["time_to_first_token"] = time.perf_counter() - start
+            stats["chunks"] += 1
+            stats["characters"] += len(chunk)
+            received.append(chunk)
+            yield chunk
+        stats["total_time"] = time.perf_counter() - start
+        
+        if cached is None:
+            self._cache_store(key, LLMResponse("".join(received)))
+    
+    def generate_product_review(self, product_data: Dict) -> str:
+        """Generate a complete product review HTML page"""
+        try:
+            content = self._complete(self._review_request(product_data))
+            return self._create_review_html(product_data, content)
             
-            content = response.choices[0].message.content
+        except Exception as e:
+            print(f"Error generating review: {e}")
+            return None
+    
+    def generate_blog_article(self, topic: str, keywords: List[str]) -> str:
+        """Generate a comprehensive blog article"""
+        try:
+            content = self._complete(self._article_request(topic, keywords))
             return self._create_blog_html(topic, content, keywords)
             
         except Exception as e:
             print(f"Error generating article: {e}")
             return None
     
-    def _create_review_html(self, product_data: Dict, ai_content: str) -> str:
-        """Create complete HTML page for product review"""
+    def stream_product_review(self, product_data: Dict, write: Callable[[str], object],
+                              on_chunk: Optional[Callable[[str], object]] = None) -> bool:
+        """Stream a review page through ``write`` while the completion is generated
         
-        # Read the template
+        The page is written up to the rating as soon as the first token arrives;
+        the rest follows once the pros and cons are known. ``on_chunk`` receives
+        the raw AI text for live previews.
+        """
         try:
-            with open('review-echo-dot.html', 'r', encoding='utf-8') as f:
-                template = f.read()
-        except FileNotFoundError:
-            print("Template file not found. Make sure review-echo-dot.html exists.")
-            return None
+            template = self.templates.get(REVIEW_TEMPLATE, REVIEW_SLOTS)
+            page = template.writer(write)
+            values = review_values(product_data)
+            
+            parser = SectionParser()
+            for chunk in self._stream(self._review_request(product_data)):
+                if not page.done:
+                    page.flush(values)
+                parser.feed(chunk)
+                if on_chunk:
+                    on_chunk(chunk)
+            
+            sections = parser.close()
+            rating = self._calculate_rating(sections.get('pros', []), sections.get('cons', []))
+            values.update(review_values(product_data, rating))
+            self._record_source({"kind": "review", "filename": review_filename(product_data),
+                                 "product": product_data, "sections": sections})
+            return page.flush(values)
+            
+        except Exception as e:
+            print(f"Error streaming review: {e}")
+            return False
+    
+    def stream_blog_article(self, topic: str, keywords: List[str], write: Callable[[str], object],
+                            on_chunk: Optional[Callable[[str], object]] = None) -> bool:
+        """Stream a blog article page through ``write`` as soon as the first token arrives"""
+        try:
+            template = self.templates.get(BLOG_TEMPLATE, BLOG_SLOTS)
+            page = template.writer(write)
+            values = blog_values(topic, keywords, datetime.now().strftime("%B %d, %Y"))
+            
+            for chunk in self._stream(self._article_request(topic, keywords)):
+                if not page.done:
+                    page.flush(values)
+                if on_chunk:
+                    on_chunk(chunk)
+            
+            self._record_source({"kind": "blog", "filename": blog_filename(topic), "topic": topic,
+                                 "keywords": keywords, "date": values["date"]})
+            return page.flush(values)
+            
+        except Exception as e:
+            print(f"Error streaming article: {e}")
+            return False
+    
+    def generate_product_reviews_batched(self, products: List[Dict], batch_size: int = 4) -> List[Optional[str]]:
+        """Generate reviews by packing products of the same category into shared requests
         
-        # Extract sections from AI content
-        sections = self._parse_ai_content(ai_content)
+        Returns HTML aligned with ``products`` (None for failures). Products whose
+        batched answer cannot be parsed fall back to single requests. Prompt token
+        savings against one request per product accumulate in ``batch_stats``.
+        """
+        results = [None] * len(products)
+        by_category = {}
+        for index, product in enumerate(products):
+            by_category.setdefault(product['category'], []).append(index)
+        
+        for indexes in by_category.values():
+            for start in range(0, len(indexes), max(1, batch_size)):
+                group = indexes[start:start + batch_size]
+                group_products = [products[i] for i in group]
+                sections_list = None
+                
+                if len(group) > 1:
+                    try:
+                        request = self._batched_review_request(group_products)
+                        response = self._complete_response(request)
+                        sections_list = parse_json_reviews(response.content, len(group))
+                        self._record_batch_savings(request, response, group_products)
+                    except Exception as e:
+                        print(f"Error generating batched reviews: {e}")
+                
+                for position, index in enumerate(group):
+                    sections = sections_list[position] if sections_list else None
+                    if sections is None:
+                        if len(group) > 1:
+                            self.batch_stats["fallbacks"] += 1
+                        results[index] = self.generate_product_review(products[index])
+                    else:
+                        self._record_source({"kind": "review", "filename": review_filename(products[index]),
+                                             "product": products[index], "sections": sections})
+                        results[index] = self._render_review_html(products[index], sections)
+        
+        return results
+    
+    def _record_batch_savings(self, request: Dict, response: LLMResponse, products: List[Dict]):
+        """Compare a batched request's prompt tokens with one request per product"""
+        prompt_tokens = response.prompt_tokens or sum(estimate_tokens(m["content"]) for m in request["messages"])
+        single_tokens = sum(
+            estimate_tokens(m["content"])
+            for product in products
+            for m in self._review_request(product)["messages"]
+        )
+        stats = self.batch_stats
+        stats["pages"] += len(products)
+        stats["requests"] += 1
+        stats["prompt_tokens"] += prompt_tokens
+        stats["single_prompt_tokens"] += single_tokens
+        stats["tokens_saved_per_page"] = (stats["single_prompt_tokens"] - stats["prompt_tokens"]) / stats["pages"]
+        print(f"📦 Batched {len(products)} reviews in one request: "
+              f"~{(single_tokens - prompt_tokens) / len(products):.0f} prompt tokens saved per page")
+    
+    async def agenerate_product_review(self, product_data: Dict) -> Optional[str]:
+        """Asynchronous variant of generate_product_review"""
+        try:
+            content = await self._acomplete(self._review_request(product_data))
+            return self._create_review_html(product_data, content)
+            
+        except Exception as e:
+            print(f"Error generating review: {e}")
+            return None
+    
+    async def agenerate_blog_article(self, topic: str, keywords: List[str]) -> Optional[str]:
+        """Asynchronous variant of generate_blog_article"""
+        try:
+            content = await self._acomplete(self._article_request(topic, keywords))
+            return self._create_blog_html(topic, content, keywords)
+            
+        except Exception as e:
+            print(f"Error generating article: {e}")
+            return None
+    
+    async def _run_bounded(self, items: List, worker, concurrency: int) -> AsyncIterator[Tuple[int, Optional[str]]]:
+        """Run ``worker(item)`` with at most ``concurrency`` in flight, yielding (index, result) as each finishes"""
+        semaphore = asyncio.Semaphore(max(1, concurrency))
         
-        # Generate filename
-        filename = f"review-{product_data['name'].lower().replace(' ', '-').replace('(', '').replace(')', '')}.html"
+        async def run(index, item):
+            async with semaphore:
+                return index, await worker(item)
         
-        # Replace template placeholders
-        html_content = template
+        tasks = [asyncio.ensure_future(run(i, item)) for i, item in enumerate(items)]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def generate_reviews_batch(self, products: List[Dict], concurrency: int = 5) -> AsyncIterator[Tuple[int, Optional[str]]]:
+        """Generate reviews concurrently, yielding (index, html) in completion order
         
-        # Update title and meta tags
-        html_content = html_content.replace(
-            "Amazon Echo Dot (5th Gen) Review - Smart Speaker Analysis | TechReview Hub",
-            f"{product_data['name']} Review - {product_data['category']} Analysis | TechReview Hub"
-        )
+        ``html`` is None for products that failed, matching generate_product_review.
+        """
+        async for result in self._run_bounded(products, self.agenerate_product_review, concurrency):
+            yield result
+    
+    async def generate_articles_batch(self, topics: List[Dict], concurrency: int = 5) -> AsyncIterator[Tuple[int, Optional[str]]]:
+        """Generate articles for {"title", "keywords"} topics, yielding (index, html) as each finishes"""
+        async def worker(topic):
+            return await self.agenerate_blog_article(topic['title'], topic['keywords'])
         
-        html_content = html_content.replace(
-            "Comprehensive review of the Amazon Echo Dot (5th Gen)",
-            f"Comprehensive review of the {product_data['name']}"
-        )
+        async for result in self._run_bounded(topics, worker, concurrency):
+            yield result
+    
+    def _create_review_html(self, product_data: Dict, ai_content: str) -> str:
+        """Create complete HTML page for product review"""
         
-        # Update product name throughout
-        html_content = html_content.replace("Amazon Echo Dot (5th Gen)", product_data['name'])
-        html_content = html_content.replace("Echo Dot", product_data['name'])
+        try:
+            template = self.templates.get(REVIEW_TEMPLATE, REVIEW_SLOTS)
+        except FileNotFoundError:
+            print(f"Template file not found. Make sure {REVIEW_TEMPLATE} exists.")
+            return None
         
-        # Update price
-        html_content = html_content.replace("$49.99", f"${product_data['price']}")
+        # Extract sections from AI content
+        sections = self._parse_ai_content(ai_content)
+        self._record_source({"kind": "review", "filename": review_filename(product_data),
+                             "product": product_data, "ai_content": ai_content})
+        return self._render_review_html(product_data, sections, template)
+    
+    def _render_review_html(self, product_data: Dict, sections: Dict, template=None) -> Optional[str]:
+        """Render a review page from parsed sections"""
+        if template is None:
+            try:
+                template = self.templates.get(REVIEW_TEMPLATE, REVIEW_SLOTS)
+            except FileNotFoundError:
+                print(f"Template file not found. Make sure {REVIEW_TEMPLATE} exists.")
+                return None
         
         # Update rating (generate based on pros/cons ratio)
         rating = self._calculate_rating(sections.get('pros', []), sections.get('cons', []))
-        html_content = html_content.replace("4.8/5", f"{rating}/5")
         
-        return html_content
+        return template.render(review_values(product_data, rating))
     
     def _create_blog_html(self, topic: str, ai_content: str, keywords: List[str]) -> str:
         """Create complete HTML page for blog article"""
         
         try:
-            with open('blog-smart-home-trends-2025.html', 'r', encoding='utf-8') as f:
-                template = f.read()
+            template = self.templates.get(BLOG_TEMPLATE, BLOG_SLOTS)
         except FileNotFoundError:
-            print("Template file not found. Make sure blog-smart-home-trends-2025.html exists.")
+            print(f"Template file not found. Make sure {BLOG_TEMPLATE} exists.")
             return None
         
-        # Generate filename
-        filename = f"blog-{topic.lower().replace(' ', '-').replace('&', 'and')}.html"
-        
-        # Replace template content
-        html_content = template
-        
-        # Update title and meta tags
-        html_content = html_content.replace(
-            "Top Smart Home Trends to Watch in 2025",
-            topic
-        )
-        
-        html_content = html_content.replace(
-            "smart home trends 2025, home automation, AI technology, IoT devices, smart home future",
-            ', '.join(keywords)
-        )
-        
-        # Update date
-        current_date = datetime.now().strftime("%B %d, %Y")
-        html_content = html_content.replace("January 2, 2025", current_date)
-        
-        return html_content
+        date = datetime.now().strftime("%B %d, %Y")
+        self._record_source({"kind": "blog", "filename": blog_filename(topic), "topic": topic,
+                             "keywords": keywords, "date": date, "ai_content": ai_content})
+        return template.render(blog_values(topic, keywords, date))
+    
+    def _record_source(self, source: Dict):
+        """Keep the inputs of a rendered page for site rebuilds"""
+        if not self.content_dir:
+            return
+        self._page_sources[source["filename"]] = source
+        try:
+            save_page_source(source, self.content_dir)
+        except Exception as e:
+            print(f"Error recording page source: {e}")
     
     def _parse_ai_content(self, content: str) -> Dict:
         """Parse AI-generated content into structured sections"""
-        sections = {}
-        
-        # Extract pros and cons
-        pros_match = re.search(r'Pros:?\s*\n(.*?)(?=Cons:|$)', content, re.DOTALL | re.IGNORECASE)
-        if pros_match:
-            pros_text = pros_match.group(1)
-            sections['pros'] = [line.strip('- ').strip() for line in pros_text.split('\n') if line.strip()]
-        
-        cons_match = re.search(r'Cons:?\s*\n(.*?)(?=\n\n|$)', content, re.DOTALL | re.IGNORECASE)
-        if cons_match:
-            cons_text = cons_match.group(1)
-            sections['cons'] = [line.strip('- ').strip() for line in cons_text.split('\n') if line.strip()]
-        
-        return sections
+        return parse_sections(content)
     
     def _calculate_rating(self, pros: List[str], cons: List[str]) -> float:
         """Calculate product rating based on pros and cons"""
-        if not pros and not cons:
-            return 4.5
-        
-        pros_count = len(pros)
-        cons_count = len(cons)
-        
-        # Base rating calculation
-        if pros_count > cons_count * 2:
-            return 4.8
-        elif pros_count > cons_count:
-            return 4.5
-        elif pros_count == cons_count:
-            return 4.2
-        else:
-            return 3.9
+        return calculate_rating(pros, cons)
     
-    def save_content(self, filename: str, content: str) -> bool:
-        """Save generated content to file"""
+    def save_content(self, filename: str, content: str,
+                     on_commit: Optional[Callable[[str], None]] = None) -> bool:
+        """Save generated content to file, skipping pages whose build inputs are unchanged
+        
+        ``on_commit(path)`` runs once the page is on disk: straight away outside a
+        write batch, otherwise when the batch commits.
+        """
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(content)
+            source = self._page_sources.pop(filename, None)
+            path = os.path.join(self.output_dir, filename)
+            inputs = None
+            if source and self.manifest:
+                inputs = self.manifest.page_inputs(source, self.base_template_path)
+                if self.manifest.is_fresh(filename, inputs, path):
+                    print(f"Content unchanged, keeping {filename}")
+                    if on_commit:
+                        on_commit(path)
+                    return True
+            
+            # Atomic so readers on a shared output root never see a partial page.
+            # Inside a write batch the page lands when the batch commits, so the
+            # manifest (and the caller) only ever see pages that are really on disk.
+            def committed(path):
+                if inputs:
+                    self.manifest.record(filename, inputs, path)
+                    self.manifest.save_if_due()
+                if on_commit:
+                    on_commit(path)
+            self.writer.write_text(path, content, committed)
             print(f"Content saved to {filename}")
             return True
         except Exception as e:
             print(f"Error saving content: {e}")
             return False
 
+async def _batch_generate(ai: TechReviewAI, products: List[Dict], topics: List[Dict], concurrency: int = 5):
+    """Generate reviews and articles concurrently, saving each page as it finishes"""
+    with ai.writer.batch():
+        await _generate_and_save(ai, products, topics, concurrency)
+    stats = ai.writer.stats()
+    print(f"💾 Wrote {stats['files']} files ({stats['bytes'] / 1024:.0f} KB) with {stats['fsyncs']} fsyncs")
+
+
+async def _generate_and_save(ai: TechReviewAI, products: List[Dict], topics: List[Dict], concurrency: int):
+    async for index, review_html in ai.generate_reviews_batch(products, concurrency):
+        product = products[index]
+        if review_html:
+            filename = review_filename(product)
+            ai.save_content(filename, review_html)
+            print(f"✅ Generated: {filename}")
+        else:
+            print(f"❌ Failed to generate review for {product['name']}")
+    
+    async for index, article_html in ai.generate_articles_batch(topics, concurrency):
+        topic = topics[index]['title']
+        if article_html:
+            filename = blog_filename(topic)
+            ai.save_content(filename, article_html)
+            print(f"✅ Generated: {filename}")
+        else:
+            print(f"❌ Failed to generate article: {topic}")
+
+
+def benchmark_batch_throughput(count: int = 50, concurrency: int = 10, latency: float = 0.5) -> float:
+    """Measure batch review throughput against the offline fake backend (reviews/second)"""
+    ai = TechReviewAI(api_key="", backend=FakeLLMBackend(latency=latency, seed=0), use_cache=False,
+                      metrics=LLMMetrics(path=None), limiter=RateLimiter(rpm=100000, tpm=10 ** 9),
+                      content_dir=None)
+    products = [
+        {"name": f"Benchmark Device {i}", "category": "Smart Speaker", "price": "49.99",
+         "brand": "Bench", "features": ["Voice control", "Compact design"]}
+        for i in range(count)
+    ]
+    
+    async def run():
+        completed = 0
+        async for _, html in ai.generate_reviews_batch(products, concurrency):
+            completed += 1 if html else 0
+        return completed
+    
+    start = time.perf_counter()
+    completed = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+    throughput = count / elapsed if elapsed else float('inf')
+    
+    summary = ai.metrics.summary()
+    print(f"⏱️ {completed}/{count} reviews in {elapsed:.2f}s "
+          f"(concurrency={concurrency}, latency={latency}s): {throughput:.1f} reviews/s, "
+          f"p50 {summary['latency_p50']:.2f}s / p95 {summary['latency_p95']:.2f}s")
+    return throughput
+
+
 def main():
     """Main function to demonstrate AI content generation"""
     
+    if len(sys.argv) > 1 and sys.argv[1] == 'benchmark':
+        benchmark_batch_throughput()
+        return
+    
     # Check for API key
     api_key = os.getenv('OPENAI_API_KEY')
     if not api_key:
@@ -293,7 +663,7 @@ def main():
             review_html = ai.generate_product_review(product)
             
             if review_html:
-                filename = f"review-{product['name'].lower().replace(' ', '-').replace('(', '').replace(')', '')}.html"
+                filename = review_filename(product)
                 ai.save_content(filename, review_html)
                 print(f"✅ Product review generated: {filename}")
             else:
@@ -307,7 +677,7 @@ def main():
             article_html = ai.generate_blog_article(topic, keywords)
             
             if article_html:
-                filename = f"blog-{topic.lower().replace(' ', '-').replace(':', '').replace('?', '')}.html"
+                filename = blog_filename(topic)
                 ai.save_content(filename, article_html)
                 print(f"✅ Blog article generated: {filename}")
             else:
@@ -317,30 +687,10 @@ def main():
             # Batch generate sample content
             print("\nGenerating batch content...")
             
-            # Generate reviews for all sample products
-            for i, product in enumerate(sample_products):
-                print(f"Generating review {i+1}/{len(sample_products)}: {product['name']}")
-                review_html = ai.generate_product_review(product)
-                
-                if review_html:
-                    filename = f"review-{product['name'].lower().replace(' ', '-').replace('(', '').replace(')', '')}.html"
-                    ai.save_content(filename, review_html)
-                    print(f"✅ Generated: {filename}")
-                else:
-                    print(f"❌ Failed to generate review for {product['name']}")
-            
-            # Generate articles for sample topics
-            for i, topic in enumerate(sample_topics[:2]):  # Generate first 2 topics
-                print(f"Generating article {i+1}/2: {topic}")
-                keywords = ["smart home", "automation", "tech guide", "2025 trends"]
-                article_html = ai.generate_blog_article(topic, keywords)
-                
-                if article_html:
-                    filename = f"blog-{topic.lower().replace(' ', '-').replace(':', '').replace('?', '')}.html"
-                    ai.save_content(filename, article_html)
-                    print(f"✅ Generated: {filename}")
-                else:
-                    print(f"❌ Failed to generate article: {topic}")
+            # Generate sample reviews and the first 2 topics concurrently
+            keywords = ["smart home", "automation", "tech guide", "2025 trends"]
+            topics = [{"title": topic, "keywords": keywords} for topic in sample_topics[:2]]
+            asyncio.run(_batch_generate(ai, sample_products, topics))
             
             print("\n🎉 Batch generation complete!")
         
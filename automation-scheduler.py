@@ -4,42 +4,112 @@ Automation Scheduler for TechReview Hub
 Automatically schedules and runs AI content generation tasks
 """
 
-import schedule
+import argparse
 import time
 import os
 import json
 import logging
+import socket
+import sys
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from ai_content_generator import TechReviewAI
+from functools import cached_property
+from typing import Callable, Dict, List, Optional
+from job_pool import JobPool
+from job_queue import PRODUCTS, QUEUE_DB, TOPICS, JobQueue
+from log_setup import log_context, setup_logging
+from output_writer import atomic_write_text
+
+# schedule, the content generator (and with it openai), the homepage updater,
+# backups and the status server are imported on first use so that quick
+# commands like ``queue list`` start fast
 
 # Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('automation.log'),
-        logging.StreamHandler()
-    ]
-)
+setup_logging('automation.log')
+
+# Per-job limits: (seconds before a run is reported as slow, max concurrent runs)
+JOB_LIMITS = {
+    "daily_review": (1800, 1),
+    "weekly_article": (1800, 1),
+    "health_check": (120, 1),
+    "backup": (3600, 1),
+    "status": (30, 1),
+    "reclaim": (30, 1),
+}
 
 class AutomationScheduler:
-    def __init__(self, api_key: str):
-        """Initialize the automation scheduler"""
-        self.ai = TechReviewAI(api_key)
-        self.products_queue = []
-        self.topics_queue = []
+    def __init__(self, api_key: str, max_workers: int = 4, output_root: Optional[str] = None):
+        """Initialize the automation scheduler
+        
+        ``output_root`` (default: $TECHREVIEW_ROOT or the current directory) holds
+        the queue database, generated pages, page sources, response cache and
+        homepage; worker machines pointed at the same root share all of them.
+        Set $TECHREVIEW_SHARED_ROOT=1 on every machine when the root is on a
+        network filesystem, so the queue database avoids WAL (one host only).
+        """
+        self.api_key = api_key
+        self.output_root = output_root or os.getenv('TECHREVIEW_ROOT', '.')
+        self.pool = JobPool(max_workers=max_workers)
+        self._wakeup = threading.Event()
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_seconds = 1800
+        self.queue = JobQueue(os.path.join(self.output_root, QUEUE_DB),
+                              shared=os.getenv('TECHREVIEW_SHARED_ROOT') == '1')
         self.load_content_queues()
+    
+    @cached_property
+    def ai(self):
+        from ai_content_generator import TechReviewAI
+        return TechReviewAI(self.api_key, metrics=self._llm_metrics(), output_dir=self.output_root)
+    
+    def _llm_metrics(self):
+        from llm_metrics import DEFAULT_METRICS_PATH, LLMMetrics
+        return LLMMetrics(os.path.join(self.output_root, DEFAULT_METRICS_PATH))
+    
+    @cached_property
+    def backup_store(self):
+        from backup_store import BACKUP_DIR, BackupStore
+        return BackupStore(os.path.join(self.output_root, BACKUP_DIR))
+    
+    @cached_property
+    def homepage(self):
+        from homepage_updater import HOMEPAGE, HomepageUpdater
+        from site_builder import CONTENT_DIR
+        return HomepageUpdater(os.path.join(self.output_root, HOMEPAGE),
+                               content_dir=os.path.join(self.output_root, CONTENT_DIR))
+    
+    @cached_property
+    def status(self):
+        from health_status import REQUIRED_FILES, StatusCollector
+        if "ai" in vars(self):
+            metrics, cache = self.ai.metrics, self.ai.cache
+        else:
+            # Read-only view for commands that never generate content: don't
+            # create .cache/ and an empty database just to report on them
+            from llm_cache import DEFAULT_CACHE_PATH, ResponseCache
+            cache_path = os.path.join(self.output_root, DEFAULT_CACHE_PATH)
+            metrics = self._llm_metrics()
+            cache = ResponseCache(cache_path) if os.path.exists(cache_path) else None
+        return StatusCollector(
+            queue=self.queue, queue_names=[PRODUCTS, TOPICS], pool=self.pool,
+            metrics=metrics, cache=cache, disk_path=self.output_root,
+            required_files=[os.path.join(self.output_root, name) for name in REQUIRED_FILES]
+        )
         
     def load_content_queues(self):
-        """Load content queues from JSON files"""
+        """Import legacy JSON queues once, or seed the default queues on first run"""
         try:
             # Load products queue
-            if os.path.exists('products_queue.json'):
-                with open('products_queue.json', 'r') as f:
-                    self.products_queue = json.load(f)
-            else:
+            products_json = os.path.join(self.output_root, 'products_queue.json')
+            if os.path.exists(products_json):
+                imported = self.queue.import_json(PRODUCTS, products_json)
+                if imported:
+                    logging.info(f"📥 Imported {imported} products from products_queue.json")
+            elif not self.queue.get_meta(f"imported:{PRODUCTS}"):
                 # Create default products queue
-                self.products_queue = [
+                default_products = [
                     {
                         "name": "Apple HomePod Mini",
                         "category": "Smart Speaker",
@@ -80,15 +150,19 @@ class AutomationScheduler:
                         ]
                     }
                 ]
-                self.save_products_queue()
+                for product in default_products:
+                    self.queue.put(PRODUCTS, product)
+                self.queue.set_meta(f"imported:{PRODUCTS}", "defaults")
             
             # Load topics queue
-            if os.path.exists('topics_queue.json'):
-                with open('topics_queue.json', 'r') as f:
-                    self.topics_queue = json.load(f)
-            else:
+            topics_json = os.path.join(self.output_root, 'topics_queue.json')
+            if os.path.exists(topics_json):
+                imported = self.queue.import_json(TOPICS, topics_json)
+                if imported:
+                    logging.info(f"📥 Imported {imported} topics from topics_queue.json")
+            elif not self.queue.get_meta(f"imported:{TOPICS}"):
                 # Create default topics queue
-                self.topics_queue = [
+                default_topics = [
                     {
                         "title": "Smart Home Security Systems: Complete Buyer's Guide 2025",
                         "keywords": ["smart security", "home security", "security cameras", "smart locks"]
@@ -106,212 +180,595 @@ class AutomationScheduler:
                         "keywords": ["smart thermostat", "energy saving", "Nest", "Ecobee"]
                     }
                 ]
-                self.save_topics_queue()
+                for topic in default_topics:
+                    self.queue.put(TOPICS, topic)
+                self.queue.set_meta(f"imported:{TOPICS}", "defaults")
                 
         except Exception as e:
             logging.error(f"Error loading content queues: {e}")
     
+    @property
+    def products_queue(self):
+        """Pending products in claim order"""
+        return self.queue.pending(PRODUCTS)
+    
+    @property
+    def topics_queue(self):
+        """Pending topics in claim order"""
+        return self.queue.pending(TOPICS)
+    
     def save_products_queue(self):
-        """Save products queue to JSON file"""
+        """Export a JSON snapshot of pending products (backups and manual inspection)"""
         try:
-            with open('products_queue.json', 'w') as f:
-                json.dump(self.products_queue, f, indent=2)
+            atomic_write_text(os.path.join(self.output_root, 'products_queue.json'),
+                              json.dumps(self.products_queue, indent=2))
         except Exception as e:
             logging.error(f"Error saving products queue: {e}")
     
     def save_topics_queue(self):
-        """Save topics queue to JSON file"""
+        """Export a JSON snapshot of pending topics (backups and manual inspection)"""
         try:
-            with open('topics_queue.json', 'w') as f:
-                json.dump(self.topics_queue, f, indent=2)
+            atomic_write_text(os.path.join(self.output_root, 'topics_queue.json'),
+                              json.dumps(self.topics_queue, indent=2))
         except Exception as e:
             logging.error(f"Error saving topics queue: {e}")
     
     def generate_daily_review(self):
         """Generate a daily product review"""
-        if not self.products_queue:
-            logging.warning("No products in queue for review generation")
-            return
-        
         try:
-            # Get next product from queue
-            product = self.products_queue.pop(0)
-            logging.info(f"Generating review for: {product['name']}")
-            
-            # Generate review
-            review_html = self.ai.generate_product_review(product)
-            
-            if review_html:
-                # Save review
-                filename = f"review-{product['name'].lower().replace(' ', '-').replace('(', '').replace(')', '')}.html"
-                success = self.ai.save_content(filename, review_html)
+            # Lease next product from queue
+            job = self.queue.claim(PRODUCTS, self.worker_id)
+            if job is None:
+                logging.warning("No products in queue for review generation")
+                return
+            self._run_review_job(job)
+        except Exception as e:
+            logging.error(f"Error in daily review generation: {e}")
+    
+    def _run_review_job(self, job, retry_delay: float = 0.0) -> bool:
+        """Generate and save the review for a claimed product job"""
+        with log_context(job_id=job.id, queue=job.queue, attempt=job.attempts):
+            try:
+                product = job.payload
+                logging.info(f"Generating review for: {product['name']} (attempt {job.attempts})")
                 
-                if success:
-                    logging.info(f"✅ Daily review generated: {filename}")
-                    # Update homepage with new review (you can implement this)
-                    self.update_homepage_featured_reviews(product, filename)
-                else:
+                # Generate review
+                review_html = self.ai.generate_product_review(product)
+                
+                if review_html:
+                    # Save review
+                    from ai_content_generator import review_filename
+                    filename = review_filename(product)
+                    success = self.ai.save_content(filename, review_html, self._complete_on_commit(
+                        job, f"✅ Review generated: {filename}",
+                        lambda: self.update_homepage_featured_reviews(product, filename)
+                    ))
+                    
+                    if success:
+                        return True
                     logging.error(f"Failed to save review: {filename}")
                     # Put product back in queue
-                    self.products_queue.insert(0, product)
-            else:
-                logging.error(f"Failed to generate review for: {product['name']}")
-                # Put product back in queue
-                self.products_queue.insert(0, product)
-            
-            # Save updated queue
-            self.save_products_queue()
+                    self.queue.fail(job.id, "save failed", retry_delay, self.worker_id)
+                else:
+                    logging.error(f"Failed to generate review for: {product['name']}")
+                    # Put product back in queue
+                    self.queue.fail(job.id, "generation failed", retry_delay, self.worker_id)
             
-        except Exception as e:
-            logging.error(f"Error in daily review generation: {e}")
+            except Exception as e:
+                logging.error(f"Error in review generation: {e}")
+                self.queue.fail(job.id, str(e), retry_delay, self.worker_id)
+            return False
     
     def generate_weekly_article(self):
         """Generate a weekly blog article"""
-        if not self.topics_queue:
-            logging.warning("No topics in queue for article generation")
-            return
-        
         try:
-            # Get next topic from queue
-            topic_data = self.topics_queue.pop(0)
-            logging.info(f"Generating article: {topic_data['title']}")
-            
-            # Generate article
-            article_html = self.ai.generate_blog_article(
-                topic_data['title'], 
-                topic_data['keywords']
-            )
-            
-            if article_html:
-                # Save article
-                filename = f"blog-{topic_data['title'].lower().replace(' ', '-').replace(':', '').replace('?', '')}.html"
-                success = self.ai.save_content(filename, article_html)
+            # Lease next topic from queue
+            job = self.queue.claim(TOPICS, self.worker_id)
+            if job is None:
+                logging.warning("No topics in queue for article generation")
+                return
+            self._run_article_job(job)
+        except Exception as e:
+            logging.error(f"Error in weekly article generation: {e}")
+    
+    def _run_article_job(self, job, retry_delay: float = 0.0) -> bool:
+        """Generate and save the article for a claimed topic job"""
+        with log_context(job_id=job.id, queue=job.queue, attempt=job.attempts):
+            try:
+                topic_data = job.payload
+                logging.info(f"Generating article: {topic_data['title']} (attempt {job.attempts})")
                 
-                if success:
-                    logging.info(f"✅ Weekly article generated: {filename}")
-                    # Update homepage with new article (you can implement this)
-                    self.update_homepage_blog_section(topic_data, filename)
-                else:
+                # Generate article
+                article_html = self.ai.generate_blog_article(
+                    topic_data['title'], 
+                    topic_data['keywords']
+                )
+                
+                if article_html:
+                    # Save article
+                    from ai_content_generator import blog_filename
+                    filename = blog_filename(topic_data['title'])
+                    success = self.ai.save_content(filename, article_html, self._complete_on_commit(
+                        job, f"✅ Article generated: {filename}",
+                        lambda: self.update_homepage_blog_section(topic_data, filename)
+                    ))
+                    
+                    if success:
+                        return True
                     logging.error(f"Failed to save article: {filename}")
                     # Put topic back in queue
-                    self.topics_queue.insert(0, topic_data)
-            else:
-                logging.error(f"Failed to generate article: {topic_data['title']}")
-                # Put topic back in queue
-                self.topics_queue.insert(0, topic_data)
-            
-            # Save updated queue
-            self.save_topics_queue()
+                    self.queue.fail(job.id, "save failed", retry_delay, self.worker_id)
+                else:
+                    logging.error(f"Failed to generate article: {topic_data['title']}")
+                    # Put topic back in queue
+                    self.queue.fail(job.id, "generation failed", retry_delay, self.worker_id)
             
-        except Exception as e:
-            logging.error(f"Error in weekly article generation: {e}")
+            except Exception as e:
+                logging.error(f"Error in article generation: {e}")
+                self.queue.fail(job.id, str(e), retry_delay, self.worker_id)
+            return False
+    
+    def _complete_on_commit(self, job, message: str, publish: Callable[[], None]) -> Callable[[str], None]:
+        """Callback that completes ``job`` and publishes its page once the page is on disk
+        
+        Inside a drain's write batch a saved page is only staged until the batch
+        commits. Completing the job earlier would lose the page to a crash with
+        no retry; left leased, the job is requeued when its lease runs out.
+        """
+        def on_commit(path):
+            with log_context(job_id=job.id, queue=job.queue, attempt=job.attempts):
+                try:
+                    # A lost lease means another worker owns the job now and will publish it
+                    if self.queue.complete(job.id, self.worker_id):
+                        logging.info(message)
+                        publish()
+                except Exception as e:
+                    logging.error(f"Error completing job {job.id}: {e}")
+        return on_commit
     
     def update_homepage_featured_reviews(self, product, filename):
-        """Update homepage with new featured review"""
-        # This is a placeholder - implement based on your needs
-        logging.info(f"Homepage updated with new review: {product['name']}")
+        """Queue a featured review card for the next homepage rewrite"""
+        self.homepage.add_review(product, filename)
     
     def update_homepage_blog_section(self, topic_data, filename):
-        """Update homepage with new blog article"""
-        # This is a placeholder - implement based on your needs
-        logging.info(f"Homepage updated with new article: {topic_data['title']}")
+        """Queue a latest-article card for the next homepage rewrite"""
+        self.homepage.add_article(topic_data, filename)
     
-    def health_check(self):
-        """Perform system health check"""
+    def health_check(self) -> bool:
+        """Perform system health check; returns False when it failed or found problems
+        
+        Only reads the queue, metrics and disk, so it never loads the content
+        generator (or needs an API key).
+        """
         try:
             logging.info("🔍 Performing health check...")
+            status = self.refresh_status()
             
             # Check if queues have content
-            if len(self.products_queue) < 5:
-                logging.warning(f"Products queue low: {len(self.products_queue)} items remaining")
-            
-            if len(self.topics_queue) < 3:
-                logging.warning(f"Topics queue low: {len(self.topics_queue)} items remaining")
+            products_depth = status["queues"][PRODUCTS]["depth"]
+            topics_depth = status["queues"][TOPICS]["depth"]
+            if products_depth < 5:
+                logging.warning(f"Products queue low: {products_depth} items remaining")
             
-            # Check disk space
-            import shutil
-            total, used, free = shutil.disk_usage(".")
-            free_gb = free // (1024**3)
+            if topics_depth < 3:
+                logging.warning(f"Topics queue low: {topics_depth} items remaining")
             
-            if free_gb < 1:
-                logging.warning(f"Low disk space: {free_gb}GB remaining")
+            # Report LLM latency and spend for today
+            llm = status["llm"]
+            if llm.get("calls"):
+                logging.info(
+                    f"📈 LLM calls today: {llm['calls']} ({llm['failures']} failed, {llm['retries']} retries), "
+                    f"latency p50 {llm['latency_p50'] or 0:.1f}s / p95 {llm['latency_p95'] or 0:.1f}s, "
+                    f"spend ${llm['cost']:.2f}"
+                )
+            self.status.metrics.export_prometheus(os.path.join(self.output_root, 'llm_metrics.prom'))
             
-            # Check if website files exist
-            required_files = ['index.html', 'styles.css', 'script.js']
-            for file in required_files:
-                if not os.path.exists(file):
-                    logging.error(f"Missing required file: {file}")
+            # Disk space and required website files
+            for problem in status["problems"]:
+                logging.warning(f"⚠️ {problem}")
             
             logging.info("✅ Health check completed")
+            return not status["problems"]
             
         except Exception as e:
             logging.error(f"Error in health check: {e}")
+            return False
+    
+    def refresh_status(self) -> Dict:
+        """Rewrite the status file from the cached status sections"""
+        from health_status import STATUS_FILE
+        return self.status.write(os.path.join(self.output_root, STATUS_FILE))
     
     def backup_content(self):
-        """Create backup of generated content"""
+        """Create an incremental backup of generated content and apply the retention policy"""
         try:
-            import shutil
-            from datetime import datetime
-            
-            backup_dir = f"backups/backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            os.makedirs(backup_dir, exist_ok=True)
-            
-            # Backup HTML files
-            for file in os.listdir('.'):
-                if file.endswith('.html'):
-                    shutil.copy2(file, backup_dir)
+            # Readable queue exports go alongside the copy of the queue database
+            self.save_products_queue()
+            self.save_topics_queue()
             
-            # Backup queue files
-            if os.path.exists('products_queue.json'):
-                shutil.copy2('products_queue.json', backup_dir)
-            if os.path.exists('topics_queue.json'):
-                shutil.copy2('topics_queue.json', backup_dir)
+            stats = self.backup_store.backup(root=self.output_root)
+            logging.info(f"✅ Backup created: {stats['name']} ({stats['files']} files, "
+                         f"{stats['new_blobs']} changed, {stats['new_bytes'] / 1024:.1f} KB new)")
             
-            logging.info(f"✅ Backup created: {backup_dir}")
+            pruned = self.backup_store.prune()
+            if pruned["snapshots_removed"]:
+                logging.info(f"🧹 Pruned {pruned['snapshots_removed']} old backups "
+                             f"({pruned['bytes_freed'] / 1024:.1f} KB freed)")
             
         except Exception as e:
             logging.error(f"Error creating backup: {e}")
     
-    def start_scheduler(self):
-        """Start the automation scheduler"""
+    def budget_remaining(self, daily_budget: Optional[float] = None,
+                         daily_token_budget: Optional[int] = None) -> bool:
+        """True while today's LLM spend and token use are under the given limits"""
+        if daily_budget is None and daily_token_budget is None:
+            return True
+        llm = self.ai.metrics.summary()
+        if daily_budget is not None and llm["cost"] >= daily_budget:
+            return False
+        if daily_token_budget is not None and llm["prompt_tokens"] + llm["completion_tokens"] >= daily_token_budget:
+            return False
+        return True
+    
+    def _next_job(self, queues: List[str], turn: int, prefetched: deque, prefetch: int = 0):
+        """Next job to run, taking from the queues round-robin so reviews and articles drain together
+        
+        With ``prefetch`` jobs are leased in batches to cut round trips to a shared
+        queue; when the queues run dry, unstarted jobs are stolen from busier workers.
+        """
+        while prefetched:
+            job = prefetched.popleft()
+            if self.queue.start(job, self.worker_id):
+                return job
+        
+        for i in range(len(queues)):
+            name = queues[(turn + i) % len(queues)]
+            if not prefetch:
+                job = self.queue.claim(name, self.worker_id, self.lease_seconds)
+                if job is not None:
+                    return job
+                continue
+            batch = self.queue.claim_batch(name, self.worker_id, prefetch, self.lease_seconds)
+            if batch:
+                prefetched.extend(batch)
+                return self._next_job(queues, turn, prefetched)
+        
+        if prefetch:
+            stolen = self.queue.steal(queues, self.worker_id, self.lease_seconds)
+            if stolen is not None and self.queue.start(stolen, self.worker_id):
+                logging.info(f"🦝 Stole job {stolen.id} from a busier worker")
+                return stolen
+        return None
+    
+    def drain_queues(self, concurrency: int = 4, daily_budget: Optional[float] = None,
+                     daily_token_budget: Optional[int] = None, queues: Optional[List[str]] = None,
+                     retry_delay: float = 300, stop_when_empty: bool = True, prefetch: int = 0,
+                     poll_interval: Optional[float] = None) -> Dict[str, int]:
+        """Work through the content queues as fast as concurrency, rate limit and daily budget allow
+        
+        Up to ``concurrency`` jobs run at once; the shared rate limiter paces the
+        LLM calls they make. When today's spend or token use reaches its budget
+        no new jobs are claimed until midnight, when the budget window resets.
+        Jobs already running when the budget runs out are allowed to finish.
+        Unless ``stop_when_empty``, empty queues are polled every ``poll_interval``
+        seconds (default ``retry_delay``) for new work.
+        """
+        queues = queues or [PRODUCTS, TOPICS]
+        runners = {PRODUCTS: self._run_review_job, TOPICS: self._run_article_job}
+        stats = {"completed": 0, "failed": 0, "pauses": 0}
+        start = time.monotonic()
+        logging.info(f"🚰 Draining {', '.join(queues)} with {concurrency} workers "
+                     f"(budget: ${daily_budget if daily_budget is not None else '∞'}, "
+                     f"{daily_token_budget if daily_token_budget is not None else '∞'} tokens/day)")
+        
+        # Batch homepage rewrites while many pages complete in quick succession
+        debounce = self.homepage.debounce
+        self.homepage.debounce = max(debounce, 30.0)
+        
+        running = set()
+        prefetched = deque()
+        turn = 0
+        # Sync finished pages in groups rather than one by one; a group is
+        # committed after 50 pages or 10 seconds, and only then are its jobs
+        # completed and its pages queued for the homepage
+        writer = self.ai.writer
+        with writer.batch(max_files=50, max_delay=10), \
+                ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="drain") as executor:
+            try:
+                while True:
+                    writer.commit_if_due()
+                    # Top up the worker slots while the budget allows
+                    while len(running) < concurrency and self.budget_remaining(daily_budget, daily_token_budget):
+                        job = self._next_job(queues, turn, prefetched, prefetch)
+                        if job is None:
+                            break
+                        turn += 1
+                        running.add(executor.submit(runners[job.queue], job, retry_delay))
+                    
+                    if running:
+                        done, running = wait(running, timeout=10 if writer.stats()["pending"] else None,
+                                             return_when=FIRST_COMPLETED)
+                        for future in done:
+                            stats["completed" if future.result() else "failed"] += 1
+                        continue
+                    
+                    if not self.budget_remaining(daily_budget, daily_token_budget):
+                        resume = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+                        stats["pauses"] += 1
+                        logging.warning(f"💸 Daily LLM budget used up; pausing drain until {resume:%Y-%m-%d %H:%M}")
+                        writer.commit()
+                        self._wakeup.wait(timeout=(resume - datetime.now()).total_seconds())
+                        self._wakeup.clear()
+                        continue
+                    
+                    # Nothing claimable: remaining jobs are finished, leased elsewhere or waiting out a retry delay
+                    if stop_when_empty:
+                        break
+                    writer.commit()
+                    self._wakeup.wait(timeout=poll_interval or retry_delay)
+                    self._wakeup.clear()
+            except KeyboardInterrupt:
+                logging.info("🛑 Drain stopped by user; finishing running jobs")
+                for future in running:
+                    future.cancel()
+            finally:
+                if prefetched:
+                    self.queue.release(self.worker_id)
+        
+        self.homepage.debounce = debounce
+        self.homepage.flush()
+        
+        elapsed = time.monotonic() - start
+        written = writer.stats()
+        logging.info(f"✅ Drain finished: {stats['completed']} completed, {stats['failed']} failed, "
+                     f"{stats['pauses']} budget pauses in {elapsed / 60:.1f} min; "
+                     f"wrote {written['bytes'] / 1024:.0f} KB in {written['fsyncs']} fsyncs "
+                     f"(p95 write latency {(written['latency_p95'] or 0) * 1000:.0f} ms)")
+        return stats
+    
+    def run_worker(self, concurrency: int = 4, prefetch: Optional[int] = None, heartbeat_interval: float = 15.0,
+                   **drain_options) -> Dict[str, int]:
+        """Work the shared queues as one of several worker machines until interrupted
+        
+        The worker registers in the queue database and heartbeats every
+        ``heartbeat_interval`` seconds, renewing all of its leases at once. Leases
+        are short, so the jobs of a worker that stops heartbeating are requeued
+        by the coordinator or any other worker within a few intervals.
+        """
+        prefetch = prefetch or concurrency
+        self.lease_seconds = heartbeat_interval * 4
+        self.queue.register_worker(self.worker_id, {"host": socket.gethostname(), "pid": os.getpid(),
+                                                    "concurrency": concurrency})
+        logging.info(f"👷 Worker {self.worker_id} joined {os.path.abspath(self.output_root)}")
+        
+        stop = threading.Event()
+        
+        def heartbeat():
+            while not stop.wait(heartbeat_interval):
+                try:
+                    self.queue.heartbeat(self.worker_id, self.lease_seconds)
+                    reclaimed = self.queue.reclaim_dead(self.lease_seconds)
+                    if reclaimed:
+                        logging.warning(f"♻️ Requeued {reclaimed} jobs from workers that stopped heartbeating")
+                except Exception as e:
+                    logging.error(f"Heartbeat failed: {e}")
+        
+        threading.Thread(target=heartbeat, name="heartbeat", daemon=True).start()
+        try:
+            return self.drain_queues(concurrency=concurrency, prefetch=prefetch, stop_when_empty=False,
+                                     poll_interval=heartbeat_interval, **drain_options)
+        finally:
+            stop.set()
+            self.queue.release(self.worker_id)
+    
+    def reclaim_jobs(self, stale_after: float = 60.0):
+        """Requeue jobs leased by workers that stopped heartbeating"""
+        reclaimed = self.queue.reclaim_dead(stale_after)
+        if reclaimed:
+            logging.warning(f"♻️ Requeued {reclaimed} jobs from workers that stopped heartbeating")
+    
+    def _schedule_job(self, when, name, func):
+        """Schedule ``func`` to run on the worker pool under its JOB_LIMITS entry"""
+        warn_after, max_concurrent = JOB_LIMITS[name]
+        when.do(self.pool.submit, name, func, warn_after=warn_after, max_concurrent=max_concurrent)
+    
+    def start_scheduler(self, coordinator: bool = False):
+        """Start the automation scheduler
+        
+        As the ``coordinator`` of several workers it leaves content generation to
+        them and instead requeues the jobs of workers that stop heartbeating.
+        """
+        import schedule
+        from health_status import STATUS_HOST, STATUS_PORT, start_status_server
+        
+        # Load the generator before the status collector so both share its metrics and cache
+        self.ai
+        
         logging.info("🚀 Starting TechReview Hub Automation Scheduler")
         
         # Schedule daily tasks
-        schedule.every().day.at("09:00").do(self.generate_daily_review)
-        schedule.every().day.at("12:00").do(self.health_check)
+        if not coordinator:
+            self._schedule_job(schedule.every().day.at("09:00"), "daily_review", self.generate_daily_review)
+        self._schedule_job(schedule.every().day.at("12:00"), "health_check", self.health_check)
         
         # Schedule weekly tasks
-        schedule.every().monday.at("10:00").do(self.generate_weekly_article)
-        schedule.every().sunday.at("23:00").do(self.backup_content)
+        if not coordinator:
+            self._schedule_job(schedule.every().monday.at("10:00"), "weekly_article", self.generate_weekly_article)
+        self._schedule_job(schedule.every().sunday.at("23:00"), "backup", self.backup_content)
+        
+        if coordinator:
+            self._schedule_job(schedule.every().minute, "reclaim", self.reclaim_jobs)
+        
+        # Keep status.json current and serve it over HTTP (STATUS_PORT=0 disables the server)
+        self._schedule_job(schedule.every().minute, "status", self.refresh_status)
+        status_port = int(os.getenv('STATUS_PORT', STATUS_PORT))
+        if status_port:
+            try:
+                start_status_server(self.status, STATUS_HOST, status_port)
+            except OSError as e:
+                logging.error(f"Could not start status endpoint on port {status_port}: {e}")
         
         logging.info("📅 Scheduled tasks:")
-        logging.info("  - Daily review generation: 9:00 AM")
+        if coordinator:
+            logging.info(f"  - Coordinating workers on {os.path.abspath(self.output_root)}")
+            logging.info("  - Dead worker job reclaim: every minute")
+        else:
+            logging.info("  - Daily review generation: 9:00 AM")
+            logging.info("  - Weekly article generation: Monday 10:00 AM")
         logging.info("  - Daily health check: 12:00 PM")
-        logging.info("  - Weekly article generation: Monday 10:00 AM")
         logging.info("  - Weekly backup: Sunday 11:00 PM")
+        logging.info("  - Status file refresh: every minute (status.json)")
+        logging.info(f"  - Jobs run on a pool of {self.pool.max_workers} workers")
         
         # Run scheduler
         while True:
             try:
                 schedule.run_pending()
-                time.sleep(60)  # Check every minute
+                self.pool.check_slow_jobs()
+                
+                # Sleep until the next job is due or a running job turns slow
+                waits = [w for w in (schedule.idle_seconds(), self.pool.next_warning()) if w is not None]
+                self._wakeup.wait(timeout=max(0.0, min(waits)) if waits else 60)
+                self._wakeup.clear()
             except KeyboardInterrupt:
                 logging.info("🛑 Scheduler stopped by user")
+                self.pool.shutdown()
+                self.homepage.flush()
                 break
             except Exception as e:
                 logging.error(f"Scheduler error: {e}")
                 time.sleep(300)  # Wait 5 minutes before retrying
 
+def _require_api_key() -> Optional[str]:
+    api_key = os.getenv('OPENAI_API_KEY')
+    if not api_key:
+        print("❌ Please set your OPENAI_API_KEY environment variable")
+        print("Example: export OPENAI_API_KEY='your-api-key-here'")
+    return api_key
+
+
+def _drain_from_env(scheduler: AutomationScheduler, concurrency: Optional[int] = None,
+                    daily_budget: Optional[float] = None, daily_tokens: Optional[int] = None):
+    """Drain the queues; DAILY_BUDGET_USD / DAILY_TOKEN_BUDGET / DRAIN_CONCURRENCY fill in unset limits"""
+    if daily_budget is None and os.getenv('DAILY_BUDGET_USD'):
+        daily_budget = float(os.getenv('DAILY_BUDGET_USD'))
+    if daily_tokens is None and os.getenv('DAILY_TOKEN_BUDGET'):
+        daily_tokens = int(os.getenv('DAILY_TOKEN_BUDGET'))
+    print("\n🚰 Draining content queues...")
+    print("Press Ctrl+C to stop")
+    scheduler.drain_queues(
+        concurrency=concurrency or int(os.getenv('DRAIN_CONCURRENCY', 4)),
+        daily_budget=daily_budget,
+        daily_token_budget=daily_tokens
+    )
+
+
+def print_queues(scheduler: AutomationScheduler, limit: int = 3):
+    print(f"\n📋 Content Queues:")
+    print(f"Products in queue: {scheduler.queue.depth(PRODUCTS)}")
+    for i, product in enumerate(scheduler.queue.pending(PRODUCTS, limit=limit)):
+        print(f"  {i+1}. {product['name']}")
+    
+    print(f"\nTopics in queue: {scheduler.queue.depth(TOPICS)}")
+    for i, topic in enumerate(scheduler.queue.pending(TOPICS, limit=limit)):
+        print(f"  {i+1}. {topic['title']}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="automation-scheduler.py",
+        description="TechReview Hub automation scheduler (runs the interactive menu without a command)"
+    )
+    commands = parser.add_subparsers(dest="command")
+    
+    parser.add_argument("--root", help="shared output root (default: $TECHREVIEW_ROOT or the current directory)")
+    start_parser = commands.add_parser("start", help="run the automated scheduler")
+    start_parser.add_argument("--coordinator", action="store_true",
+                              help="coordinate worker machines instead of generating content")
+    
+    worker_parser = commands.add_parser("worker", help="generate content from the shared queues until stopped")
+    worker_parser.add_argument("--concurrency", type=int, default=4)
+    worker_parser.add_argument("--prefetch", type=int, help="jobs leased per round trip (default: concurrency)")
+    worker_parser.add_argument("--heartbeat", type=float, default=15.0, help="heartbeat interval in seconds")
+    worker_parser.add_argument("--budget", type=float, help="daily spend limit in USD for this worker")
+    worker_parser.add_argument("--tokens", type=int, help="daily token limit for this worker")
+    commands.add_parser("workers", help="list registered workers")
+    
+    queue_parser = commands.add_parser("queue", help="inspect or extend the content queues")
+    queue_commands = queue_parser.add_subparsers(dest="queue_command", required=True)
+    list_parser = queue_commands.add_parser("list", help="show queue depth and the next items")
+    list_parser.add_argument("--limit", type=int, default=3)
+    add_parser = queue_commands.add_parser("add", help="queue a product or topic given as JSON")
+    add_parser.add_argument("queue", choices=[PRODUCTS, TOPICS])
+    add_parser.add_argument("payload", help="JSON object, e.g. '{\"title\": ..., \"keywords\": [...]}'")
+    add_parser.add_argument("--priority", type=int, default=0)
+    
+    generate_parser = commands.add_parser("generate", help="generate one piece of content now")
+    generate_parser.add_argument("kind", choices=["review", "article"])
+    
+    drain_parser = commands.add_parser("drain", help="work through the queues under a daily budget")
+    drain_parser.add_argument("--concurrency", type=int)
+    drain_parser.add_argument("--budget", type=float, help="daily spend limit in USD")
+    drain_parser.add_argument("--tokens", type=int, help="daily token limit")
+    
+    commands.add_parser("status", help="print the current health status as JSON")
+    commands.add_parser("health", help="run the health check")
+    commands.add_parser("backup", help="create an incremental backup now")
+    return parser
+
+
+def run_command(args: argparse.Namespace) -> int:
+    """Run a non-interactive subcommand; returns the process exit code"""
+    api_key = os.getenv('OPENAI_API_KEY')
+    if args.command in ("start", "worker", "generate", "drain") and not _require_api_key():
+        return 1
+    scheduler = AutomationScheduler(api_key, output_root=args.root)
+    
+    if args.command == "start":
+        scheduler.start_scheduler(coordinator=args.coordinator)
+    elif args.command == "worker":
+        scheduler.run_worker(args.concurrency, args.prefetch, args.heartbeat,
+                             daily_budget=args.budget, daily_token_budget=args.tokens)
+    elif args.command == "workers":
+        for worker in scheduler.queue.workers():
+            print(f"  {worker['id']}: {worker['status']}, heartbeat {worker['heartbeat_age']}s ago, "
+                  f"{worker['leased']} leased, {worker['completed']} completed")
+    elif args.command == "queue" and args.queue_command == "list":
+        print_queues(scheduler, args.limit)
+    elif args.command == "queue" and args.queue_command == "add":
+        job_id = scheduler.queue.put(args.queue, json.loads(args.payload), priority=args.priority)
+        print(f"➕ Queued job {job_id} on {args.queue}")
+    elif args.command == "generate":
+        if args.kind == "review":
+            scheduler.generate_daily_review()
+        else:
+            scheduler.generate_weekly_article()
+        scheduler.homepage.flush()
+    elif args.command == "drain":
+        _drain_from_env(scheduler, args.concurrency, args.budget, args.tokens)
+    elif args.command == "status":
+        status = scheduler.status.snapshot()
+        status["problems"] = scheduler.status.problems(status)
+        print(json.dumps(status, indent=2, default=str))
+        return 1 if status["problems"] else 0
+    elif args.command == "health":
+        return 0 if scheduler.health_check() else 1
+    elif args.command == "backup":
+        scheduler.backup_content()
+    return 0
+
+
 def main():
     """Main function"""
+    if len(sys.argv) > 1:
+        sys.exit(run_command(build_parser().parse_args()))
+    
     print("🤖 TechReview Hub Automation Scheduler")
     print("=====================================")
     
     # Check for API key
-    api_key = os.getenv('OPENAI_API_KEY')
+    api_key = _require_api_key()
     if not api_key:
-        print("❌ Please set your OPENAI_API_KEY environment variable")
-        print("Example: export OPENAI_API_KEY='your-api-key-here'")
         return
     
     # Initialize scheduler
@@ -322,9 +779,10 @@ def main():
     print("2. Generate content now (manual)")
     print("3. View content queues")
     print("4. Add content to queues")
-    print("5. Exit")
+    print("5. Drain content queues (throughput mode)")
+    print("6. Exit")
     
-    choice = input("\nEnter your choice (1-5): ").strip()
+    choice = input("\nEnter your choice (1-6): ").strip()
     
     if choice == '1':
         print("\n🚀 Starting automated scheduler...")
@@ -344,26 +802,23 @@ def main():
             scheduler.generate_weekly_article()
         else:
             print("❌ Invalid choice")
+        scheduler.homepage.flush()
     
     elif choice == '3':
-        print(f"\n📋 Content Queues:")
-        print(f"Products in queue: {len(scheduler.products_queue)}")
-        for i, product in enumerate(scheduler.products_queue[:3]):
-            print(f"  {i+1}. {product['name']}")
-        
-        print(f"\nTopics in queue: {len(scheduler.topics_queue)}")
-        for i, topic in enumerate(scheduler.topics_queue[:3]):
-            print(f"  {i+1}. {topic['title']}")
+        print_queues(scheduler)
     
     elif choice == '4':
-        print("\n➕ Add content to queues (feature coming soon)")
-        print("Edit products_queue.json and topics_queue.json manually for now")
+        print("\n➕ Add content to queues")
+        print("Use: python automation-scheduler.py queue add products '{\"name\": ..., \"category\": ..., \"price\": ...}'")
     
     elif choice == '5':
+        _drain_from_env(scheduler)
+    
+    elif choice == '6':
         print("👋 Goodbye!")
     
     else:
         print("❌ Invalid choice")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
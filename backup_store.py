@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Backup Store for TechReview Hub
+Incremental, content-addressed backups with retention, restore and verify
+"""
+
+import glob
+import hashlib
+import io
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tarfile
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from job_queue import QUEUE_DB
+from output_writer import atomic_write_text
+
+BACKUP_DIR = "backups"
+BACKUP_PATTERNS = ["*.html", "products_queue.json", "topics_queue.json", "generated_content/*.json"]
+# SQLite databases, copied through the backup API so a snapshot never catches a write half-done
+BACKUP_DATABASES = [QUEUE_DB]
+ARCHIVE_FORMATS = {"tar": "", "gz": "gz", "xz": "xz", "zst": None}
+CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: str) -> str:
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _fsync_dir(path: str):
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def copy_database(path: str, target: str):
+    """Consistent copy of the SQLite database at ``path``, taken while other connections keep writing"""
+    source = sqlite3.connect(path)
+    try:
+        copy = sqlite3.connect(target)
+        try:
+            source.backup(copy)
+        finally:
+            copy.close()
+    finally:
+        source.close()
+
+
+def collect_files(patterns: Iterable[str] = BACKUP_PATTERNS, root: str = ".") -> List[str]:
+    """Relative paths of the files matching ``patterns`` under ``root``"""
+    paths = set()
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(root, pattern)):
+            if os.path.isfile(path):
+                paths.add(os.path.relpath(path, root))
+    return sorted(paths)
+
+
+class BackupStore:
+    """Snapshots of the site stored as file manifests over a shared blob store
+
+    Every distinct file content is stored once under ``blobs/<sha256>``; a
+    snapshot is a small JSON manifest mapping paths to blob hashes, so a backup
+    of an unchanged site costs one manifest file. Files whose size and mtime
+    match the previous snapshot are not re-hashed. New blobs are synced to disk
+    before the manifest that references them is written.
+    """
+
+    def __init__(self, backup_dir: str = BACKUP_DIR):
+        self.backup_dir = backup_dir
+        self.blob_dir = os.path.join(backup_dir, "blobs")
+        self.snapshot_dir = os.path.join(backup_dir, "snapshots")
+        os.makedirs(self.blob_dir, exist_ok=True)
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], digest)
+
+    def snapshots(self) -> List[str]:
+        """Snapshot names, oldest first"""
+        return sorted(name[:-5] for name in os.listdir(self.snapshot_dir) if name.endswith(".json"))
+
+    def load_snapshot(self, name: str) -> Dict:
+        with open(os.path.join(self.snapshot_dir, name + ".json"), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _store_blob(self, path: str, digest: str) -> bool:
+        """Copy ``path`` into the blob store unless the content is already there"""
+        target = self.blob_path(digest)
+        if os.path.exists(target):
+            return False
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, 'wb') as out, open(path, 'rb') as src:
+                shutil.copyfileobj(src, out, CHUNK_SIZE)
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return True
+
+    def backup(self, paths: Optional[List[str]] = None, root: str = ".",
+               databases: Iterable[str] = BACKUP_DATABASES) -> Dict:
+        """Snapshot ``paths`` and ``databases`` (relative to ``root``); only new content is copied"""
+        paths = collect_files(root=root) if paths is None else paths
+        previous = self.snapshots()
+        previous_files = self.load_snapshot(previous[-1])["files"] if previous else {}
+
+        files = {}
+        new_blobs = new_bytes = 0
+        blob_dirs = set()
+        for rel_path in paths:
+            full_path = os.path.join(root, rel_path)
+            stat = os.stat(full_path)
+            known = previous_files.get(rel_path)
+            if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns \
+                    and os.path.exists(self.blob_path(known["sha256"])):
+                digest = known["sha256"]
+            else:
+                digest = hash_file(full_path)
+                if self._store_blob(full_path, digest):
+                    new_blobs += 1
+                    new_bytes += stat.st_size
+                    blob_dirs.add(os.path.dirname(self.blob_path(digest)))
+            files[rel_path] = {"sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+        for rel_path in databases:
+            full_path = os.path.join(root, rel_path)
+            if not os.path.exists(full_path):
+                continue
+            # The live file (and its WAL) changes under us; back up a consistent copy instead
+            with tempfile.TemporaryDirectory(dir=self.backup_dir) as scratch:
+                copy_path = os.path.join(scratch, os.path.basename(rel_path))
+                copy_database(full_path, copy_path)
+                size = os.path.getsize(copy_path)
+                digest = hash_file(copy_path)
+                if self._store_blob(copy_path, digest):
+                    new_blobs += 1
+                    new_bytes += size
+                    blob_dirs.add(os.path.dirname(self.blob_path(digest)))
+            files[rel_path] = {"sha256": digest, "size": size, "mtime_ns": os.stat(full_path).st_mtime_ns}
+
+        # A manifest must never reference a blob that a crash could still lose
+        for directory in blob_dirs:
+            _fsync_dir(directory)
+
+        name = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        while name in previous:
+            name += "_1"
+        snapshot = {"name": name, "created": time.time(), "files": files}
+        atomic_write_text(os.path.join(self.snapshot_dir, name + ".json"),
+                          json.dumps(snapshot, indent=1, sort_keys=True))
+
+        return {
+            "name": name,
+            "files": len(files),
+            "bytes": sum(entry["size"] for entry in files.values()),
+            "new_blobs": new_blobs,
+            "new_bytes": new_bytes,
+        }
+
+    def restore(self, name: str, target_dir: str = ".", paths: Optional[List[str]] = None) -> int:
+        """Restore a snapshot (or some of its ``paths``) into ``target_dir``; returns files written"""
+        files = self.load_snapshot(name)["files"]
+        restored = 0
+        for rel_path in paths or sorted(files):
+            entry = files[rel_path]
+            blob = self.blob_path(entry["sha256"])
+            if hash_file(blob) != entry["sha256"]:
+                raise ValueError(f"Blob for {rel_path} is corrupt: {entry['sha256']}")
+            target = os.path.join(target_dir, rel_path)
+            os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+            shutil.copyfile(blob, target + ".restore-tmp")
+            if rel_path in BACKUP_DATABASES:
+                # A leftover write-ahead log would be replayed onto the restored database
+                for suffix in ("-wal", "-shm"):
+                    if os.path.exists(target + suffix):
+                        os.remove(target + suffix)
+            os.replace(target + ".restore-tmp", target)
+            os.utime(target, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+            restored += 1
+        return restored
+
+    def verify(self, names: Optional[List[str]] = None) -> List[str]:
+        """Check that every blob referenced by the snapshots exists and matches its hash; returns problems"""
+        problems = []
+        checked = {}
+        for name in names or self.snapshots():
+            for rel_path, entry in self.load_snapshot(name)["files"].items():
+                digest = entry["sha256"]
+                if digest not in checked:
+                    blob = self.blob_path(digest)
+                    checked[digest] = os.path.exists(blob) and hash_file(blob) == digest
+                if not checked[digest]:
+                    problems.append(f"{name}: {rel_path} ({digest[:12]}) missing or corrupt")
+        return problems
+
+    def prune(self, keep_last: int = 7, keep_weekly: int = 8, keep_monthly: int = 12) -> Dict[str, int]:
+        """Apply the retention policy, then delete blobs no remaining snapshot references
+
+        Keeps the ``keep_last`` newest snapshots plus the newest snapshot of each
+        of the last ``keep_weekly`` ISO weeks and ``keep_monthly`` months.
+        """
+        snapshots = self.snapshots()
+        created = {name: datetime.fromtimestamp(self.load_snapshot(name)["created"]) for name in snapshots}
+
+        keep = set(snapshots[-keep_last:]) if keep_last else set()
+        for period, limit in ((lambda d: d.isocalendar()[:2], keep_weekly), (lambda d: (d.year, d.month), keep_monthly)):
+            seen = []
+            for name in reversed(snapshots):
+                key = period(created[name])
+                if key not in seen:
+                    if len(seen) >= limit:
+                        break
+                    seen.append(key)
+                    keep.add(name)
+
+        removed = [name for name in snapshots if name not in keep]
+        for name in removed:
+            os.remove(os.path.join(self.snapshot_dir, name + ".json"))
+
+        referenced = {entry["sha256"] for name in keep for entry in self.load_snapshot(name)["files"].values()}
+        freed_blobs = freed_bytes = 0
+        for blob in glob.glob(os.path.join(self.blob_dir, "*", "*")):
+            if os.path.basename(blob) not in referenced:
+                freed_bytes += os.path.getsize(blob)
+                os.remove(blob)
+                freed_blobs += 1
+        return {"snapshots_removed": len(removed), "blobs_removed": freed_blobs, "bytes_freed": freed_bytes}
+
+    def archive(self, name: str, path: str, compression: str = "gz") -> str:
+        """Export a snapshot as a self-contained tar archive (tar, gz, xz, or zst with ``zstandard`` installed)"""
+        if compression not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unknown compression: {compression}")
+        files = self.load_snapshot(name)["files"]
+
+        def add_files(tar):
+            for rel_path in sorted(files):
+                entry = files[rel_path]
+                info = tar.gettarinfo(self.blob_path(entry["sha256"]), arcname=rel_path)
+                info.mtime = entry["mtime_ns"] / 1e9
+                with open(self.blob_path(entry["sha256"]), 'rb') as f:
+                    tar.addfile(info, f)
+            manifest = json.dumps(self.load_snapshot(name), indent=1, sort_keys=True).encode('utf-8')
+            info = tarfile.TarInfo(".snapshot.json")
+            info.size = len(manifest)
+            info.mtime = time.time()
+            tar.addfile(info, io.BytesIO(manifest))
+
+        if compression == "zst":
+            import zstandard
+            with open(path, 'wb') as raw, zstandard.ZstdCompressor().stream_writer(raw) as out, \
+                    tarfile.open(fileobj=out, mode='w|') as tar:
+                add_files(tar)
+        else:
+            mode = "w:" + ARCHIVE_FORMATS[compression]
+            with tarfile.open(path, mode.rstrip(':')) as tar:
+                add_files(tar)
+        return path
+
+    def disk_usage(self) -> Dict[str, int]:
+        """Bytes used by blobs and the logical size of the newest snapshot"""
+        blobs = glob.glob(os.path.join(self.blob_dir, "*", "*"))
+        snapshots = self.snapshots()
+        latest = self.load_snapshot(snapshots[-1])["files"] if snapshots else {}
+        return {
+            "snapshots": len(snapshots),
+            "blobs": len(blobs),
+            "stored_bytes": sum(os.path.getsize(blob) for blob in blobs),
+            "latest_bytes": sum(entry["size"] for entry in latest.values()),
+        }
+
+
+def main():
+    """Command line: backup | list | restore NAME [DIR] | verify [NAME] | prune | archive NAME PATH [gz|xz|zst|tar]"""
+    print("🗄️ TechReview Hub Backup Store")
+    print("=====================================")
+
+    store = BackupStore()
+    args = sys.argv[1:] or ["backup"]
+    command = args[0]
+
+    if command == "backup":
+        stats = store.backup()
+        print(f"✅ {stats['name']}: {stats['files']} files, {stats['new_blobs']} new "
+              f"({stats['new_bytes'] / 1024:.1f} KB stored)")
+    elif command == "list":
+        for name in store.snapshots():
+            snapshot = store.load_snapshot(name)
+            print(f"  {name}  {len(snapshot['files'])} files")
+        usage = store.disk_usage()
+        print(f"{usage['blobs']} blobs, {usage['stored_bytes'] / 1024:.1f} KB on disk")
+    elif command == "restore" and len(args) >= 2:
+        restored = store.restore(args[1], args[2] if len(args) > 2 else ".")
+        print(f"✅ Restored {restored} files from {args[1]}")
+    elif command == "verify":
+        problems = store.verify(args[1:] or None)
+        for problem in problems:
+            print(f"❌ {problem}")
+        print("✅ All snapshots verified" if not problems else f"❌ {len(problems)} problems found")
+        sys.exit(1 if problems else 0)
+    elif command == "prune":
+        stats = store.prune()
+        print(f"🧹 Removed {stats['snapshots_removed']} snapshots and {stats['blobs_removed']} blobs "
+              f"({stats['bytes_freed'] / 1024:.1f} KB)")
+    elif command == "archive" and len(args) >= 3:
+        path = store.archive(args[1], args[2], args[3] if len(args) > 3 else "gz")
+        print(f"📦 Archived {args[1]} to {path}")
+    else:
+        print(main.__doc__)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+AI Content Parser for TechReview Hub
+Single-pass, line-oriented extraction of review sections from (streamed) AI output
+"""
+
+import json
+import re
+import time
+from typing import Dict, List, Optional
+
+# Section name and the heading words that introduce it, checked in order
+SECTION_HEADINGS = [
+    ("pros", ("pros", "pro", "advantages", "what we like")),
+    ("cons", ("cons", "con", "disadvantages", "what we don't like")),
+    ("intro", ("introduction", "intro", "overview")),
+    ("design", ("design",)),
+    ("performance", ("performance", "features")),
+    ("verdict", ("final verdict", "verdict", "conclusion", "rating")),
+    ("value", ("value",)),
+]
+LIST_SECTIONS = ("pros", "cons")
+
+_HEADING_PREFIX = re.compile(r"^(?:#+\s*|\d+[.)]\s*|[*_]+)+")
+_BULLET = re.compile(r"^(?:[-*•+]\s+|\d+[.)]\s+)")
+_RATING = re.compile(r"(\d(?:\.\d+)?)\s*(?:/|out of)\s*5\b", re.IGNORECASE)
+
+
+def _match_heading(line: str, strict: bool = False):
+    """Return (section, trailing text) when ``line`` is a section heading, else None
+
+    ``strict`` is used inside pros/cons lists: labels must start with a heading
+    phrase, and a numbered or bulleted line only counts when it ends with a colon
+    or is a markdown heading, so items such as "3. Value for money" stay items.
+    """
+    if len(line) > 80 or line.startswith(("-", "+", "•", "* ")):
+        return None
+    if strict and _BULLET.match(line) and not (line.startswith("#") or line.rstrip(" *_").endswith(":")):
+        return None
+
+    marked = line.startswith(("#", "*", "_")) or line[:1].isdigit()
+    label, colon, rest = _HEADING_PREFIX.sub("", line).partition(":")
+    label = label.strip(" *_").lower()
+    words = label.replace("&", " ").split()
+    if not words or len(words) > 6:
+        return None
+    # Unmarked lines without a colon are only headings when they don't read as a sentence
+    if not (marked or colon) and label.endswith((".", "!", "?")):
+        return None
+
+    for section, headings in SECTION_HEADINGS:
+        for heading in headings:
+            if label == heading or label.startswith(heading + " ") or (not strict and heading in words[:2]):
+                return section, rest.strip(" *_")
+    return None
+
+
+class SectionParser:
+    """Incremental parser: feed() text chunks as they stream in, then close()"""
+
+    def __init__(self):
+        self._pending = ""
+        self._current = "intro"
+        self._list_closed = False
+        self._blank = False
+        self._text = {}
+        self._lists = {}
+        self.rating = None
+
+    def feed(self, chunk: str):
+        """Consume a chunk of AI output, parsing every completed line"""
+        data = self._pending + chunk
+        start = 0
+        while True:
+            end = data.find("\n", start)
+            if end < 0:
+                break
+            self._line(data[start:end])
+            start = end + 1
+        self._pending = data[start:]
+
+    def close(self) -> Dict:
+        """Finish parsing and return the extracted sections"""
+        if self._pending:
+            self._line(self._pending)
+            self._pending = ""
+
+        sections = {name: "\n".join(lines) for name, lines in self._text.items() if lines}
+        sections.update({name: items for name, items in self._lists.items() if items})
+        if self.rating is not None:
+            sections["rating"] = self.rating
+        return sections
+
+    def _line(self, raw: str):
+        line = raw.strip()
+        if not line:
+            self._blank = True
+            return
+
+        heading = _match_heading(line, strict=self._current in LIST_SECTIONS)
+        if heading:
+            self._current, line = heading
+            self._list_closed = False
+            self._blank = False
+            if not line:
+                return
+
+        if self.rating is None and (self._current == "verdict" or "rating" in line.lower()):
+            match = _RATING.search(line)
+            if match:
+                self.rating = float(match.group(1))
+
+        if self._current in LIST_SECTIONS:
+            is_bullet = bool(_BULLET.match(line))
+            # A plain paragraph after a blank line ends the list, as the old parser did
+            if self._blank and not is_bullet and self._lists.get(self._current):
+                self._list_closed = True
+            if not self._list_closed:
+                self._lists.setdefault(self._current, []).append(_BULLET.sub("", line).strip())
+        else:
+            self._text.setdefault(self._current, []).append(line)
+        self._blank = False
+
+
+def parse_sections(content: str) -> Dict:
+    """Parse a complete AI response into sections"""
+    parser = SectionParser()
+    parser.feed(content)
+    return parser.close()
+
+
+# JSON keys requested by batched prompts and the section each one maps to
+JSON_SECTION_KEYS = {
+    "introduction": "intro",
+    "design": "design",
+    "performance": "performance",
+    "pros": "pros",
+    "cons": "cons",
+    "verdict": "verdict",
+    "value": "value",
+}
+
+
+def parse_json_reviews(content: str, count: int) -> Optional[List[Optional[Dict]]]:
+    """Split a batched JSON response into per-product sections
+
+    Returns None when the response is not a JSON array of ``count`` items;
+    individual malformed items come back as None.
+    """
+    text = content.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        text = text.rsplit("```", 1)[0]
+
+    try:
+        items = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(items, list) or len(items) != count:
+        return None
+
+    results = []
+    for item in items:
+        if not isinstance(item, dict) or not isinstance(item.get("pros"), list) or not isinstance(item.get("cons"), list):
+            results.append(None)
+            continue
+
+        sections = {}
+        for key, section in JSON_SECTION_KEYS.items():
+            value = item.get(key)
+            if section in LIST_SECTIONS:
+                sections[section] = [str(entry).strip() for entry in value if str(entry).strip()]
+            elif value:
+                sections[section] = str(value).strip()
+        if isinstance(item.get("rating"), (int, float)):
+            sections["rating"] = float(item["rating"])
+        results.append(sections)
+    return results
+
+
+def calculate_rating(pros: List[str], cons: List[str]) -> float:
+    """Calculate product rating based on pros and cons"""
+    if not pros and not cons:
+        return 4.5
+
+    pros_count = len(pros)
+    cons_count = len(cons)
+
+    # Base rating calculation
+    if pros_count > cons_count * 2:
+        return 4.8
+    elif pros_count > cons_count:
+        return 4.5
+    elif pros_count == cons_count:
+        return 4.2
+    else:
+        return 3.9
+
+
+def _regex_parse_pros_cons(content: str) -> Dict:
+    """Previous regex-based extraction, kept as the benchmark baseline"""
+    sections = {}
+
+    pros_match = re.search(r'Pros:?\s*\n(.*?)(?=Cons:|$)', content, re.DOTALL | re.IGNORECASE)
+    if pros_match:
+        sections['pros'] = [line.strip('- ').strip() for line in pros_match.group(1).split('\n') if line.strip()]
+
+    cons_match = re.search(r'Cons:?\s*\n(.*?)(?=\n\n|$)', content, re.DOTALL | re.IGNORECASE)
+    if cons_match:
+        sections['cons'] = [line.strip('- ').strip() for line in cons_match.group(1).split('\n') if line.strip()]
+
+    return sections
+
+
+def _sample_output(paragraphs: int) -> str:
+    """Synthetic review output with ``paragraphs`` filler paragraphs per prose section"""
+    filler = "The device handles everyday smart home tasks with ease and responds quickly to voice commands. "
+    body = "\n\n".join(filler * 4 for _ in range(paragraphs))
+    return (
+        f"## Introduction\n{body}\n\n## Design and Build Quality\n{body}\n\n"
+        f"## Performance and Features\n{body}\n\n"
+        "## Pros\n- Easy setup\n- Great value\n- Compact\n- Loud\n- Reliable\n- Smart home hub\n\n"
+        "## Cons\n- Weak bass\n- Needs app\n- No aux\n- Cloud only\n- Ads\n\n"
+        f"## Final Verdict\n{body}\nRating: 4.5/5\n\n## Value Assessment\n{body}\n"
+    )
+
+
+def benchmark_parsers(paragraph_counts=(10, 100, 1000), repeat: int = 5) -> List[Dict]:
+    """Compare the single-pass parser with the regex baseline on increasingly large outputs"""
+    results = []
+    for count in paragraph_counts:
+        content = _sample_output(count)
+        timings = {}
+        for name, parse in (("regex", _regex_parse_pros_cons), ("single_pass", parse_sections)):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                parse(content)
+            timings[name] = (time.perf_counter() - start) / repeat
+
+        results.append({"bytes": len(content), **timings})
+        print(f"{len(content):>10,} bytes  regex: {timings['regex'] * 1000:8.2f} ms  "
+              f"single-pass: {timings['single_pass'] * 1000:8.2f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    benchmark_parsers()
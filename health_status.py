@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Health Status for TechReview Hub
+Cached system status (queues, jobs, LLM calls, cache, disk) served over local HTTP and written to a status file
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+from output_writer import atomic_write_text
+from stats_utils import percentile
+
+STATUS_FILE = "status.json"
+STATUS_HOST = "127.0.0.1"
+STATUS_PORT = 8765
+REQUIRED_FILES = ['index.html', 'styles.css', 'script.js']
+
+# Seconds each section is reused before it is recomputed
+REFRESH_INTERVALS = {
+    "queues": 5,
+    "jobs": 1,
+    "llm": 30,
+    "cache": 30,
+    "disk": 60,
+    "files": 60,
+}
+DISK_HISTORY = 24 * 60  # one sample per minute for a day
+
+
+class StatusCollector:
+    """Builds the status snapshot from sections that each refresh on their own interval
+
+    Cheap sections (job stats) refresh every second; ones that touch SQLite or
+    the filesystem are reused for longer, so polling every few seconds costs
+    next to nothing.
+    """
+
+    def __init__(self, queue=None, queue_names: Optional[List[str]] = None, pool=None, metrics=None,
+                 cache=None, disk_path: str = ".", required_files: Optional[List[str]] = None,
+                 intervals: Optional[Dict[str, float]] = None):
+        self.queue = queue
+        self.queue_names = queue_names or []
+        self.pool = pool
+        self.metrics = metrics
+        self.cache = cache
+        self.disk_path = disk_path
+        self.required_files = REQUIRED_FILES if required_files is None else required_files
+        self.intervals = {**REFRESH_INTERVALS, **(intervals or {})}
+        self.started = time.time()
+        self._sections = {}
+        self._disk_samples = deque(maxlen=DISK_HISTORY)
+        self._lock = threading.Lock()
+
+    def _section(self, name: str, build: Callable[[], Dict]) -> Dict:
+        now = time.monotonic()
+        cached = self._sections.get(name)
+        if cached and now - cached[0] < self.intervals[name]:
+            return cached[1]
+        try:
+            value = build()
+        except Exception as e:
+            value = {"error": str(e)}
+        self._sections[name] = (now, value)
+        return value
+
+    def _queues(self) -> Dict:
+        if self.queue is None:
+            return {}
+        status = {}
+        for name in self.queue_names:
+            oldest = self.queue.oldest_age(name)
+            status[name] = {
+                "depth": self.queue.depth(name),
+                "oldest_age": round(oldest, 1) if oldest is not None else None,
+                **self.queue.stats(name),
+            }
+        return status
+
+    def _jobs(self) -> Dict:
+        if self.pool is None:
+            return {}
+        status = {}
+        for name, values in self.pool.snapshot().items():
+            durations = values.pop("durations")
+            status[name] = {
+                **values,
+                "duration_p50": percentile(durations, 50),
+                "duration_p95": percentile(durations, 95),
+            }
+        return status
+
+    def _llm(self) -> Dict:
+        return self.metrics.summary() if self.metrics else {}
+
+    def _cache(self) -> Dict:
+        return self.cache.stats() if self.cache else {}
+
+    def _disk(self) -> Dict:
+        total, used, free = shutil.disk_usage(self.disk_path)
+        now = time.time()
+        self._disk_samples.append((now, free))
+        first_time, first_free = self._disk_samples[0]
+        hours = (now - first_time) / 3600
+        trend = (free - first_free) / hours if hours > 0 else None
+        status = {
+            "total_bytes": total,
+            "free_bytes": free,
+            "used_percent": round(used / total * 100, 1) if total else None,
+            "free_change_per_hour": round(trend) if trend is not None else None,
+        }
+        # Hours until full at the current rate of consumption
+        if trend is not None and trend < 0:
+            status["hours_until_full"] = round(free / -trend, 1)
+        return status
+
+    def _files(self) -> Dict:
+        return {"missing": [name for name in self.required_files if not os.path.exists(name)]}
+
+    def snapshot(self) -> Dict:
+        """Current status; each section is recomputed only when its interval has passed"""
+        with self._lock:
+            return {
+                "timestamp": time.time(),
+                "uptime": round(time.time() - self.started),
+                "queues": self._section("queues", self._queues),
+                "jobs": self._section("jobs", self._jobs),
+                "llm": self._section("llm", self._llm),
+                "cache": self._section("cache", self._cache),
+                "disk": self._section("disk", self._disk),
+                "files": self._section("files", self._files),
+            }
+
+    def problems(self, status: Optional[Dict] = None) -> List[str]:
+        """Conditions that make the system unhealthy"""
+        status = status or self.snapshot()
+        problems = [f"missing required file: {name}" for name in status["files"].get("missing", [])]
+        free = status["disk"].get("free_bytes")
+        if free is not None and free < 1024 ** 3:
+            problems.append(f"low disk space: {free // 1024 ** 2} MB free")
+        for name, job in status["jobs"].items():
+            # Only runs that are overdue right now; "slow" is a lifetime count
+            if job.get("overdue"):
+                problems.append(f"job {name} has {job['overdue']} run(s) going longer than expected")
+        return problems
+
+    def write(self, path: str = STATUS_FILE) -> Dict:
+        """Write the snapshot to ``path`` atomically and return it"""
+        status = self.snapshot()
+        status["problems"] = self.problems(status)
+        atomic_write_text(path, json.dumps(status, indent=1, default=str))
+        return status
+
+
+class _StatusHandler(BaseHTTPRequestHandler):
+    collector = None
+
+    def do_GET(self):
+        if self.path in ("/", "/status"):
+            status = self.collector.snapshot()
+            status["problems"] = self.collector.problems(status)
+            self._send(200, status)
+        elif self.path == "/healthz":
+            problems = self.collector.problems()
+            self._send(503 if problems else 200, {"ok": not problems, "problems": problems})
+        else:
+            self._send(404, {"error": "not found"})
+
+    def _send(self, code: int, body: Dict):
+        data = json.dumps(body, default=str).encode('utf-8')
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Polling every few seconds would otherwise flood the log
+        pass
+
+
+def start_status_server(collector: StatusCollector, host: str = STATUS_HOST,
+                        port: int = STATUS_PORT) -> ThreadingHTTPServer:
+    """Serve /status and /healthz from a daemon thread"""
+    handler = type("StatusHandler", (_StatusHandler,), {"collector": collector})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="status-server", daemon=True).start()
+    logging.info(f"📡 Status endpoint on http://{host}:{server.server_port}/status")
+    return server
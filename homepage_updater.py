@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Homepage Updater for TechReview Hub
+Patches the featured review and latest article cards on index.html in batched, atomic rewrites
+"""
+
+import html
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from content_parser import calculate_rating, parse_sections
+from output_writer import atomic_write_text
+from site_builder import CONTENT_DIR
+
+HOMEPAGE = "index.html"
+# Generated images, relative to the homepage (written by image-generator.py)
+IMAGES_DIR = "images"
+
+# Card grid in each homepage section: (grid opening tag, card opening tag)
+SECTIONS = {
+    "reviews": ('<div class="reviews-grid">', '<article class="review-card">'),
+    "blog": ('<div class="blog-grid">', '<article class="blog-card">'),
+}
+CARD_END = "</article>"
+MAX_CARDS = 3
+
+REVIEW_CARD = """<article class="review-card">
+    <div class="review-image">
+{image}        <div class="rating-badge">{rating}/5</div>
+    </div>
+    <div class="review-content">
+        <h3>{name}</h3>
+        <p class="review-excerpt">{excerpt}</p>
+        <div class="review-meta">
+            <span class="category">{category}</span>
+            <span class="date">{date}</span>
+        </div>
+        <div class="review-actions">
+            <a href="{filename}" class="btn-read-more">Read Review</a>
+            <a href="#" class="btn-affiliate" data-product="{slug}">
+                <i class="fas fa-external-link-alt"></i>
+                Buy on Amazon
+            </a>
+        </div>
+    </div>
+</article>"""
+
+BLOG_CARD = """<article class="blog-card">
+{image}    <div class="blog-content">
+        <div class="blog-meta">
+            <span class="blog-category">{category}</span>
+            <span class="blog-date">{date}</span>
+        </div>
+        <h3>{title}</h3>
+        <p>{excerpt}</p>
+        <a href="{filename}" class="blog-link">Read More <i class="fas fa-arrow-right"></i></a>
+    </div>
+</article>"""
+
+CARD_IMAGE = """        <img src="{src}" alt="{alt}" loading="lazy">
+"""
+BLOG_IMAGE = """    <div class="blog-image">
+{image}    </div>
+"""
+
+
+def _lock_file(f):
+    """Block until this process holds an exclusive lock on the open file ``f``"""
+    if fcntl:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        return
+    f.seek(0)
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            # LK_LOCK gives up after about ten seconds; keep waiting as flock does
+            continue
+
+
+def _unlock_file(f):
+    if fcntl:
+        fcntl.flock(f, fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _excerpt(text: str, limit: int = 110) -> str:
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0].rstrip(",.;:") + "..."
+
+
+def _load_source(filename: str, content_dir: Optional[str]) -> Dict:
+    """Stored page source for ``filename`` (written by the content generator), if any"""
+    if not content_dir:
+        return {}
+    try:
+        with open(os.path.join(content_dir, filename + ".json"), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _card_image(name: str, alt: str, images_dir: str) -> str:
+    """Image line for a card when image-generator has written ``name``, else nothing"""
+    if not os.path.exists(os.path.join(images_dir, name)):
+        return ""
+    return CARD_IMAGE.format(src=html.escape(f"{IMAGES_DIR}/{name}"), alt=alt)
+
+
+def review_card(product: Dict, filename: str, content_dir: Optional[str] = CONTENT_DIR,
+                images_dir: str = IMAGES_DIR) -> str:
+    """Featured review card for a generated review page"""
+    source = _load_source(filename, content_dir)
+    sections = source.get("sections") or parse_sections(source.get("ai_content", ""))
+    rating = calculate_rating(sections.get("pros", []), sections.get("cons", [])) if sections else 4.5
+    excerpt = sections.get("intro") or f"{product['name']}: " + ", ".join(product.get("features", [])[:3])
+    slug = filename[len("review-"):-len(".html")]
+    name = html.escape(product["name"])
+    return REVIEW_CARD.format(
+        image=_card_image(slug + ".jpg", name, images_dir),
+        slug=html.escape(slug),
+        name=name,
+        rating=rating,
+        excerpt=html.escape(_excerpt(excerpt)),
+        category=html.escape(product.get("category", "")),
+        date=datetime.now().strftime("%b %Y"),
+        filename=html.escape(filename)
+    )
+
+
+def blog_card(topic_data: Dict, filename: str, images_dir: str = IMAGES_DIR) -> str:
+    """Latest article card for a generated blog page"""
+    keywords = topic_data.get("keywords", [])
+    now = datetime.now()
+    excerpt = topic_data.get("summary") or f"Everything you need to know about {', '.join(keywords[:3])}"
+    title = html.escape(topic_data["title"])
+    image = _card_image(filename[:-len(".html")] + ".jpg", title, images_dir)
+    return BLOG_CARD.format(
+        image=BLOG_IMAGE.format(image=image) if image else "",
+        title=title,
+        category=html.escape(topic_data.get("category") or (keywords[0].title() if keywords else "News")),
+        date=f"{now:%b} {now.day}, {now.year}",
+        excerpt=html.escape(_excerpt(excerpt)),
+        filename=html.escape(filename)
+    )
+
+
+class HomepageIndex:
+    """Offsets of the card grids in the homepage
+
+    Built with a few ``str.find`` calls instead of an HTML parse, and kept valid
+    across our own rewrites by shifting offsets, so it is only rebuilt when the
+    file is edited by something else.
+    """
+
+    def __init__(self, text: str):
+        # name -> (start, end, indent, cards) where text[start:end] holds the cards
+        self.grids = {}
+        self.newline = "\r\n" if "\r\n" in text else "\n"
+        for name, (grid_tag, card_tag) in SECTIONS.items():
+            grid = text.find(grid_tag)
+            if grid < 0:
+                continue
+            section_end = text.find("</section>", grid)
+            start = text.find(card_tag, grid, section_end)
+            end = text.rfind(CARD_END, grid, section_end)
+            if start < 0 or end < 0:
+                continue
+            end += len(CARD_END)
+            indent = text[text.rfind("\n", 0, start) + 1:start]
+            self.grids[name] = (start, end, indent, self._split_cards(text[start:end], card_tag))
+
+    @staticmethod
+    def _split_cards(region: str, card_tag: str) -> List[str]:
+        cards = []
+        position = region.find(card_tag)
+        while position >= 0:
+            end = region.find(CARD_END, position) + len(CARD_END)
+            cards.append(region[position:end])
+            position = region.find(card_tag, end)
+        return cards
+
+    def patch(self, text: str, updates: Dict[str, List[str]]) -> str:
+        """Apply new card lists to ``text`` and shift the index to match the result"""
+        pieces = []
+        previous_end = 0
+        shift = 0
+        for name, (start, end, indent, cards) in sorted(self.grids.items(), key=lambda item: item[1][0]):
+            new_cards = updates.get(name, cards)
+            separator = self.newline * 2 + indent
+            region = separator.join(self._indent(card, indent, self.newline) for card in new_cards)
+            pieces += [text[previous_end:start], region]
+            previous_end = end
+            self.grids[name] = (start + shift, start + shift + len(region), indent, new_cards)
+            shift += len(region) - (end - start)
+        pieces.append(text[previous_end:])
+        return "".join(pieces)
+
+    @staticmethod
+    def _indent(card: str, indent: str, newline: str) -> str:
+        """Indent continuation lines of a card (the first line follows the existing indent)"""
+        lines = card.replace("\r\n", "\n").split("\n")
+        if not all(line.startswith(indent) or not line for line in lines[1:]):
+            lines = lines[:1] + [indent + line if line else line for line in lines[1:]]
+        return newline.join(lines)
+
+
+class HomepageUpdater:
+    """Queue homepage cards and write them in debounced batches
+
+    Each ``add_*`` call queues a card; the homepage is rewritten once, atomically,
+    ``debounce`` seconds after the last addition (and never later than
+    ``max_delay`` seconds after the first pending one). A draining scheduler can
+    raise ``debounce`` so a backlog produces a handful of rewrites, not hundreds.
+    """
+
+    def __init__(self, path: str = HOMEPAGE, debounce: float = 2.0, max_delay: float = 60.0,
+                 max_cards: int = MAX_CARDS, content_dir: Optional[str] = CONTENT_DIR):
+        self.path = path
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.max_cards = max_cards
+        self.content_dir = content_dir
+        self.images_dir = os.path.join(os.path.dirname(path), IMAGES_DIR)
+        self.writes = 0
+        self._pending = {name: [] for name in SECTIONS}
+        self._first_pending = None
+        self._timer = None
+        self._lock = threading.Lock()
+        self._index = None
+        self._index_version = None
+
+    def add_review(self, product: Dict, filename: str):
+        self._add("reviews", filename, review_card(product, filename, self.content_dir, self.images_dir))
+
+    def add_article(self, topic_data: Dict, filename: str):
+        self._add("blog", filename, blog_card(topic_data, filename, self.images_dir))
+
+    def _add(self, section: str, filename: str, card: str):
+        with self._lock:
+            self._pending[section].append((filename, card))
+            now = time.monotonic()
+            if self._first_pending is None:
+                self._first_pending = now
+            delay = min(self.debounce, max(0.0, self._first_pending + self.max_delay - now))
+            if self._timer:
+                self._timer.cancel()
+            if delay <= 0:
+                self._timer = None
+            else:
+                self._timer = threading.Timer(delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if delay <= 0:
+            self.flush()
+
+    def _load_index(self) -> Tuple[str, HomepageIndex]:
+        # newline='' keeps the file's own line endings through the rewrite
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            text = f.read()
+        stat = os.stat(self.path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        if self._index is None or version != self._index_version:
+            self._index = HomepageIndex(text)
+        return text, self._index
+
+    def flush(self) -> int:
+        """Write every pending card to the homepage; returns how many were added"""
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            pending, self._pending = self._pending, {name: [] for name in SECTIONS}
+            self._first_pending = None
+            if not any(pending.values()):
+                return 0
+
+            try:
+                with self._file_lock():
+                    added = self._apply(pending)
+            except Exception as e:
+                logging.error(f"Error updating homepage: {e}")
+                # Keep the cards for the next flush
+                for section, items in pending.items():
+                    self._pending[section][:0] = items
+                return 0
+
+        logging.info(f"🏠 Homepage updated with {added} new card(s)")
+        return added
+
+    @contextmanager
+    def _file_lock(self):
+        """Serialise rewrites with other processes (and machines) sharing the homepage"""
+        with open(self.path + ".lock", 'a+') as lock:
+            _lock_file(lock)
+            try:
+                yield
+            finally:
+                _unlock_file(lock)
+
+    def _apply(self, pending: Dict[str, List[Tuple[str, str]]]) -> int:
+        """Read, patch and atomically replace the homepage (caller holds the lock); returns cards added"""
+        text, index = self._load_index()
+        updates = {}
+        for section, items in pending.items():
+            if not items or section not in index.grids:
+                continue
+            # Newest first; a page that is regenerated moves back to the top
+            new_files = {filename for filename, _ in items}
+            kept = [card for card in index.grids[section][3]
+                    if not any(f'href="{html.escape(filename)}"' in card for filename in new_files)]
+            updates[section] = ([card for _, card in reversed(items)] + kept)[:self.max_cards]
+
+        atomic_write_text(self.path, index.patch(text, updates))
+        stat = os.stat(self.path)
+        self._index_version = (stat.st_mtime_ns, stat.st_size)
+        self.writes += 1
+        return sum(len(items) for items in pending.values())
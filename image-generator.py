@@ -4,26 +4,61 @@ Automated Image Generation System for TechReview Hub
 Generates all required background images and product images using AI
 """
 
+from __future__ import annotations
+
 import os
-import requests
+import hashlib
 import json
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 import base64
 from io import BytesIO
-from PIL import Image, ImageDraw, ImageFont
 import random
+import sys
+import argparse
+import time
+
+from log_setup import setup_logging
+from output_writer import OutputWriter, atomic_write_text
+
+# Pillow and NumPy are imported inside the methods that draw so the menu and CLI start fast
+if TYPE_CHECKING:
+    from PIL import Image
+
+# Header gradient runs from the top colour to the bottom one; infographics get a grid every GRID_SPACING px
+GRADIENT_TOP = (102, 126, 234)
+GRADIENT_BOTTOM = (118, 75, 162)
+INFOGRAPHIC_FILL = (240, 247, 255)
+INFOGRAPHIC_GRID = (227, 242, 253)
+GRID_SPACING = 50
+# Part of every image's spec hash: bump it when the drawing or encoding code changes
+# so the next build regenerates everything
+RENDERER_VERSION = 3
+MANIFEST_FILE = "manifest.json"
+# Overlay font; Pillow's default font is used where it isn't installed
+FONT_FACE = "arial.ttf"
+# Responsive variants for srcset, as multiples of each image's own width. The
+# 0.5x mobile size is only made where it is at least MOBILE_MIN_WIDTH px wide
+VARIANT_SCALES = (0.5, 1, 2)
+MOBILE_MIN_WIDTH = 160
+# Encoder settings per format; variants come in every modern format Pillow can write plus
+# a JPEG/PNG fallback. AVIF speed 8 encodes 3x faster than the default for ~8% larger files
+ENCODE_OPTIONS = {
+    "JPEG": {"quality": 85, "optimize": True},
+    "PNG": {"optimize": True},
+    "WEBP": {"quality": 80},
+    "AVIF": {"quality": 60, "speed": 8},
+}
+MODERN_FORMATS = ("AVIF", "WEBP")
+FORMAT_EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "WEBP": "webp", "AVIF": "avif"}
+# Backgrounds are built with one little-endian 32-bit RGBX word per pixel: filling
+# whole words is several times faster than broadcasting 3-byte colours
+RGBX_DTYPE = '<u4'
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('image_generation.log'),
-        logging.StreamHandler()
-    ]
-)
+setup_logging('image_generation.log')
 
 class ImageGenerator:
     def __init__(self):
@@ -31,6 +66,11 @@ class ImageGenerator:
         self.images_dir = "images"
         self.ensure_images_directory()
         self.required_images = self.load_image_requirements()
+        self._canvases = {}
+        self.writer = OutputWriter()
+        self.last_build_stats = {}
+        # filename -> spec hash of the images written since the manifest was last saved
+        self._built_specs = {}
         
     def ensure_images_directory(self):
         """Create images directory if it doesn't exist"""
@@ -194,39 +234,12 @@ class ImageGenerator:
         }
     
     def generate_placeholder_image(self, filename: str, specs: Dict) -> bool:
-        """Generate a professional placeholder image"""
+        """Generate a professional placeholder image and its responsive variants"""
         try:
-            width, height = specs["size"]
-            description = specs["description"]
-            image_type = specs["type"]
-            
-            # Create image with appropriate background
-            if image_type in ["hero_background", "blog_header", "article_hero"]:
-                # Gradient background for headers
-                img = self.create_gradient_background(width, height)
-            elif image_type in ["product", "product_small", "product_icon"]:
-                # Clean white background for products
-                img = self.create_product_background(width, height)
-            elif image_type == "infographic":
-                # Light blue background for diagrams
-                img = self.create_infographic_background(width, height)
-            else:
-                # Default gray background
-                img = self.create_default_background(width, height)
-            
-            # Add text overlay
-            self.add_text_overlay(img, description, image_type)
-            
-            # Add decorative elements based on type
-            if image_type == "product":
-                self.add_product_elements(img)
-            elif image_type in ["hero_background", "blog_header"]:
-                self.add_tech_elements(img)
-            
-            # Save image
-            filepath = os.path.join(self.images_dir, filename)
-            img.save(filepath, quality=95, optimize=True)
+            for name, data in self.render_placeholder_image(filename, specs):
+                self.writer.write_bytes(os.path.join(self.images_dir, name), data)
             
+            width, height = specs["size"]
             logging.info(f"✅ Generated: {filename} ({width}x{height})")
             return True
             
@@ -234,25 +247,83 @@ class ImageGenerator:
             logging.error(f"❌ Error generating {filename}: {e}")
             return False
     
+    def render_placeholder_image(self, filename: str, specs: Dict) -> List[Tuple[str, bytes]]:
+        """Render a placeholder image and its responsive variants, encoded and optimized for the web
+        
+        Returns (filename, file bytes) for the image itself followed by every
+        variant from image_variants(). Each scale is drawn natively, with the
+        text and decorations scaled to match, except the mobile size, which
+        is downsampled from the 1x render.
+        """
+        from PIL import Image
+        image = self.render_image(filename, specs)
+        renders = {1: image}
+        files = [(filename, self._encode(image, _fallback_format(filename)))]
+        for variant in image_variants(filename, specs):
+            scale = variant["scale"]
+            if variant["file"] == filename:
+                continue
+            if scale not in renders:
+                if scale < 1:
+                    renders[scale] = renders[1].resize((variant["width"], variant["height"]), Image.LANCZOS)
+                else:
+                    renders[scale] = self.render_image(filename, specs, scale)
+            files.append((variant["file"], self._encode(renders[scale], variant["format"].upper())))
+        return files
+    
+    def _encode(self, img: Image.Image, image_format: str) -> bytes:
+        buffer = BytesIO()
+        img.save(buffer, image_format, **ENCODE_OPTIONS[image_format])
+        return buffer.getvalue()
+    
+    def render_image(self, filename: str, specs: Dict, scale: float = 1) -> Image.Image:
+        """Draw the placeholder for ``specs`` at ``scale`` times its size"""
+        width, height = (round(side * scale) for side in specs["size"])
+        description = specs["description"]
+        image_type = specs["type"]
+        
+        # Create image with appropriate background
+        if image_type in ["hero_background", "blog_header", "article_hero"]:
+            # Gradient background for headers
+            img = self.create_gradient_background(width, height)
+        elif image_type in ["product", "product_small", "product_icon"]:
+            # Clean white background for products
+            img = self.create_product_background(width, height)
+        elif image_type == "infographic":
+            # Light blue background for diagrams
+            img = self.create_infographic_background(width, height)
+        else:
+            # Default gray background
+            img = self.create_default_background(width, height)
+        
+        # Add text overlay
+        self.add_text_overlay(img, description, image_type, scale)
+        
+        # Add decorative elements based on type
+        if image_type == "product":
+            self.add_product_elements(img)
+        elif image_type in ["hero_background", "blog_header"]:
+            # Seeded by filename so every variant places the shapes alike
+            self.add_tech_elements(img, scale, random.Random(filename))
+        
+        return img
+    
     def create_gradient_background(self, width: int, height: int) -> Image.Image:
         """Create gradient background for hero images"""
-        img = Image.new('RGB', (width, height), '#667eea')
-        draw = ImageDraw.Draw(img)
+        import numpy as np
         
-        # Create gradient effect
-        for y in range(height):
-            # Gradient from blue to purple
-            ratio = y / height
-            r = int(102 + (118 - 102) * ratio)  # 102 to 118
-            g = int(126 + (75 - 126) * ratio)   # 126 to 75
-            b = int(234 + (162 - 234) * ratio)  # 234 to 162
-            
-            draw.line([(0, y), (width, y)], fill=(r, g, b))
+        # Gradient from blue to purple: one colour per row, broadcast across the width
+        ratio = np.arange(height, dtype=np.float64)[:, None] / height
+        top = np.array(GRADIENT_TOP, dtype=np.float64)
+        rows = (top + (np.array(GRADIENT_BOTTOM) - top) * ratio).astype(np.uint8)
+        pixels = self._canvas(width, height)
+        pixels[:] = _pack_rgbx(rows)[:, None]
         
-        return img
+        return _image_from_rgbx(pixels)
     
     def create_product_background(self, width: int, height: int) -> Image.Image:
         """Create clean background for product images"""
+        from PIL import Image, ImageDraw
         img = Image.new('RGB', (width, height), '#f8fafc')
         draw = ImageDraw.Draw(img)
         
@@ -264,69 +335,61 @@ class ImageGenerator:
     
     def create_infographic_background(self, width: int, height: int) -> Image.Image:
         """Create background for infographic images"""
-        img = Image.new('RGB', (width, height), '#f0f7ff')
+        from PIL import Image, ImageDraw
+        img = Image.new('RGB', (width, height), INFOGRAPHIC_FILL)
         draw = ImageDraw.Draw(img)
         
-        # Add grid pattern
-        grid_color = '#e3f2fd'
-        for x in range(0, width, 50):
-            draw.line([(x, 0), (x, height)], fill=grid_color, width=1)
-        for y in range(0, height, 50):
-            draw.line([(0, y), (width, y)], fill=grid_color, width=1)
+        # Add grid pattern. A few dozen lines drawn in C: this beats filling a
+        # NumPy grid mask (see benchmark_backgrounds), so it stays as it is
+        for x in range(0, width, GRID_SPACING):
+            draw.line([(x, 0), (x, height)], fill=INFOGRAPHIC_GRID, width=1)
+        for y in range(0, height, GRID_SPACING):
+            draw.line([(0, y), (width, y)], fill=INFOGRAPHIC_GRID, width=1)
         
         return img
     
+    def _canvas(self, width: int, height: int):
+        """Scratch RGBX array for backgrounds of this size
+        
+        Reused between images: a fresh multi-megabyte array per hero costs more
+        in page faults than filling it does. Safe because the image copies it.
+        """
+        import numpy as np
+        canvas = self._canvases.get((width, height))
+        if canvas is None:
+            canvas = self._canvases[(width, height)] = np.empty((height, width), dtype=RGBX_DTYPE)
+        return canvas
+    
     def create_default_background(self, width: int, height: int) -> Image.Image:
         """Create default background"""
+        from PIL import Image
         return Image.new('RGB', (width, height), '#f1f5f9')
     
-    def add_text_overlay(self, img: Image.Image, text: str, image_type: str):
-        """Add text overlay to image"""
+    def add_text_overlay(self, img: Image.Image, text: str, image_type: str, scale: float = 1):
+        """Add text overlay to image (``img`` drawn at ``scale`` times the design size)"""
+        from PIL import ImageDraw
         draw = ImageDraw.Draw(img)
         width, height = img.size
         
         # Choose font size based on image size
-        if width >= 800:
+        design_width = width / scale
+        if design_width >= 800:
             font_size = 36
-        elif width >= 400:
+        elif design_width >= 400:
             font_size = 24
-        elif width >= 200:
+        elif design_width >= 200:
             font_size = 16
         else:
             font_size = 12
+        font_size = round(font_size * scale)
         
-        try:
-            # Try to use a nice font (may not be available on all systems)
-            font = ImageFont.truetype("arial.ttf", font_size)
-        except:
-            # Fallback to default font
-            font = ImageFont.load_default()
-        
-        # Wrap text for better display
-        words = text.split()
-        lines = []
-        current_line = []
+        font = load_font(FONT_FACE, font_size)
         
-        for word in words:
-            current_line.append(word)
-            line_text = ' '.join(current_line)
-            bbox = draw.textbbox((0, 0), line_text, font=font)
-            line_width = bbox[2] - bbox[0]
-            
-            if line_width > width - 40:  # Leave 20px margin on each side
-                if len(current_line) > 1:
-                    current_line.pop()
-                    lines.append(' '.join(current_line))
-                    current_line = [word]
-                else:
-                    lines.append(word)
-                    current_line = []
-        
-        if current_line:
-            lines.append(' '.join(current_line))
+        # Wrap text for better display, leaving 20px margin on each side
+        lines = text_wrapper(FONT_FACE, font_size).wrap(text, width - round(40 * scale))
         
         # Calculate total text height
-        line_height = font_size + 5
+        line_height = font_size + round(5 * scale)
         total_height = len(lines) * line_height
         
         # Center text vertically
@@ -343,12 +406,14 @@ class ImageGenerator:
             y = start_y + i * line_height
             
             # Draw shadow
-            draw.text((x + 1, y + 1), line, font=font, fill=shadow_color)
+            offset = max(1, round(scale))
+            draw.text((x + offset, y + offset), line, font=font, fill=shadow_color)
             # Draw main text
             draw.text((x, y), line, font=font, fill=text_color)
     
     def add_product_elements(self, img: Image.Image):
         """Add decorative elements for product images"""
+        from PIL import ImageDraw
         draw = ImageDraw.Draw(img)
         width, height = img.size
         
@@ -363,37 +428,36 @@ class ImageGenerator:
             (width, corner_size)
         ], fill=accent_color)
     
-    def add_tech_elements(self, img: Image.Image):
+    def add_tech_elements(self, img: Image.Image, scale: float = 1, rng: random.Random = random):
         """Add tech-themed decorative elements"""
+        from PIL import ImageDraw
         draw = ImageDraw.Draw(img)
-        width, height = img.size
+        width, height = (round(side / scale) for side in img.size)
         
         # Add circuit-like lines
         line_color = 'rgba(255, 255, 255, 0.3)'
         
-        # Draw some geometric shapes
+        # Draw some geometric shapes, placed in design coordinates
         for i in range(3):
-            x = random.randint(50, width - 50)
-            y = random.randint(50, height - 50)
-            size = random.randint(20, 40)
+            x = rng.randint(50, width - 50) * scale
+            y = rng.randint(50, height - 50) * scale
+            size = rng.randint(20, 40) * scale
             
             # Draw circle
-            draw.ellipse([x, y, x + size, y + size], outline='#ffffff', width=2)
+            draw.ellipse([x, y, x + size, y + size], outline='#ffffff', width=max(1, round(2 * scale)))
     
-    def generate_all_images(self) -> bool:
-        """Generate all required images"""
+    def generate_all_images(self, workers: Optional[int] = None, force: bool = False) -> bool:
+        """Generate all required images, skipping ones that are up to date unless ``force``"""
         logging.info("🎨 Starting image generation for TechReview Hub...")
         
-        success_count = 0
+        stats = self.generate_images(self.required_images, workers, force)
+        success_count = stats["images"] + stats["skipped"]
         total_count = len(self.required_images)
         
-        for filename, specs in self.required_images.items():
-            if self.generate_placeholder_image(filename, specs):
-                success_count += 1
-            else:
-                logging.error(f"❌ Failed to generate {filename}")
-        
-        logging.info(f"✅ Generated {success_count}/{total_count} images successfully")
+        logging.info(f"✅ Generated {success_count}/{total_count} images successfully "
+                     f"({stats['images']} rebuilt with {stats['variants']} variants, {stats['skipped']} up to date; "
+                     f"{stats['bytes'] / 1024:.0f} KB in {stats['seconds']:.2f}s with {stats['workers']} workers, "
+                     f"{stats['images_per_second']:.1f} images/s)")
         
         if success_count == total_count:
             logging.info("🎉 All images generated successfully!")
@@ -402,8 +466,107 @@ class ImageGenerator:
             logging.warning(f"⚠️ {total_count - success_count} images failed to generate")
             return False
     
+    def generate_images(self, images: Dict[str, Dict], workers: Optional[int] = None, force: bool = False) -> Dict:
+        """Render, encode and write ``images`` (filename -> specs) across a process pool in one pass
+        
+        Images whose spec and files match the manifest are skipped unless
+        ``force``. Workers return finished files (each image and its responsive
+        variants), already optimized, and this process writes them in one
+        write batch as they arrive, then records them in the manifest. The
+        totals match what generate_image_manifest records: images written and
+        the bytes of their files, variants included.
+        """
+        start = time.perf_counter()
+        manifest = self.load_image_manifest()
+        jobs = [(filename, specs) for filename, specs in images.items()
+                if force or not self.is_fresh(filename, specs, manifest)]
+        workers = min(workers or os.cpu_count() or 1, max(1, len(jobs)))
+        stats = {"images": 0, "variants": 0, "failed": 0, "skipped": len(images) - len(jobs), "bytes": 0,
+                 "workers": workers}
+        if not jobs:
+            stats.update(seconds=time.perf_counter() - start, images_per_second=0.0)
+            self.last_build_stats = stats
+            return stats
+        
+        if workers == 1:
+            results = (_render_with(self, job) for job in jobs)
+            executor = None
+        else:
+            from concurrent.futures import ProcessPoolExecutor, as_completed
+            executor = ProcessPoolExecutor(max_workers=workers)
+            results = (future.result() for future in as_completed([executor.submit(_render_image, job)
+                                                                   for job in jobs]))
+        try:
+            with self.writer.batch():
+                for done, (filename, files, error) in enumerate(results, 1):
+                    if error:
+                        stats["failed"] += 1
+                        logging.error(f"❌ [{done}/{len(jobs)}] Error generating {filename}: {error}")
+                        continue
+                    for name, data in files:
+                        self.writer.write_bytes(os.path.join(self.images_dir, name), data)
+                        stats["bytes"] += len(data)
+                    self._built_specs[filename] = image_spec_hash(images[filename])
+                    stats["images"] += 1
+                    stats["variants"] += len(files) - 1
+                    width, height = images[filename]["size"]
+                    logging.info(f"✅ [{done}/{len(jobs)}] Generated: {filename} ({width}x{height}, "
+                                 f"{len(files) - 1} variants)")
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+        
+        self.generate_image_manifest()
+        stats["seconds"] = time.perf_counter() - start
+        stats["images_per_second"] = stats["images"] / stats["seconds"] if stats["seconds"] else 0.0
+        self.last_build_stats = stats
+        return stats
+    
+    def load_image_manifest(self) -> Dict:
+        """Entries of images/manifest.json by filename (empty when there is none yet)"""
+        try:
+            with open(os.path.join(self.images_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f).get("images", {})
+        except (OSError, ValueError):
+            return {}
+    
+    def is_fresh(self, filename: str, specs: Dict, manifest: Dict) -> bool:
+        """Whether the file on disk was built from ``specs`` and hasn't changed since"""
+        entry = manifest.get(filename)
+        if not entry or entry.get("spec_hash") != image_spec_hash(specs):
+            return False
+        try:
+            stat = os.stat(os.path.join(self.images_dir, filename))
+        except OSError:
+            return False
+        variants = entry.get("variants", [])
+        if len(variants) != len(image_variants(filename, specs)):
+            return False
+        for variant in variants:
+            try:
+                if os.path.getsize(os.path.join(self.images_dir, variant["file"])) != variant["bytes"]:
+                    return False
+            except OSError:
+                return False
+        if [stat.st_mtime_ns, stat.st_size] == entry.get("output_stat"):
+            return True
+        return _hash_file(os.path.join(self.images_dir, filename)) == entry.get("checksum")
+    
+    def _variant_entries(self, filename: str, specs: Dict) -> List[Dict]:
+        """Manifest records (file, width, height, format, bytes) of the variants on disk, for srcset"""
+        entries = []
+        for variant in image_variants(filename, specs):
+            try:
+                size = os.path.getsize(os.path.join(self.images_dir, variant["file"]))
+            except OSError:
+                continue
+            entries.append({"file": variant["file"], "width": variant["width"], "height": variant["height"],
+                            "format": variant["format"], "bytes": size})
+        return entries
+    
     def create_favicon(self):
         """Create favicon.ico for the website"""
+        from PIL import Image, ImageDraw
         try:
             # Create 32x32 favicon
             img = Image.new('RGB', (32, 32), '#667eea')
@@ -430,10 +593,20 @@ class ImageGenerator:
             return False
     
     def optimize_images(self):
-        """Optimize all generated images for web"""
+        """Optimize images in the images directory that the build didn't write
+        
+        Built images and their responsive variants are already encoded with
+        ENCODE_OPTIONS; re-encoding them would only change the files that the
+        manifest's freshness checks compare against.
+        """
+        from PIL import Image
         logging.info("🔧 Optimizing images for web...")
+        built = {variant["file"] for filename, specs in self.required_images.items()
+                 for variant in image_variants(filename, specs)}
         
         for filename in os.listdir(self.images_dir):
+            if filename in built:
+                continue
             if filename.lower().endswith(('.jpg', '.jpeg', '.png')):
                 try:
                     filepath = os.path.join(self.images_dir, filename)
@@ -453,23 +626,44 @@ class ImageGenerator:
         logging.info("🎉 Image optimization complete!")
     
     def generate_image_manifest(self):
-        """Generate manifest of all images"""
+        """Generate manifest of all images
+        
+        Each generated image records the hash of the spec it was built from
+        and a checksum of the file, which incremental builds compare against.
+        """
+        previous = self.load_image_manifest()
         manifest = {
             "generated_at": datetime.now().isoformat(),
             "total_images": len(self.required_images),
+            "renderer_version": RENDERER_VERSION,
             "images": {}
         }
         
         for filename, specs in self.required_images.items():
             filepath = os.path.join(self.images_dir, filename)
             if os.path.exists(filepath):
-                file_size = os.path.getsize(filepath)
+                stat = os.stat(filepath)
+                output_stat = [stat.st_mtime_ns, stat.st_size]
+                old = previous.get(filename, {})
+                # Only hash files that changed since the last manifest
+                checksum = old["checksum"] if old.get("output_stat") == output_stat else _hash_file(filepath)
+                if filename in self._built_specs:
+                    spec_hash = self._built_specs[filename]
+                elif old.get("checksum") == checksum:
+                    spec_hash = old.get("spec_hash")
+                else:
+                    # Replaced by something other than a build: its spec is unknown
+                    spec_hash = None
                 manifest["images"][filename] = {
                     "size": specs["size"],
                     "description": specs["description"],
                     "type": specs["type"],
-                    "file_size": file_size,
-                    "status": "generated"
+                    "file_size": stat.st_size,
+                    "status": "generated",
+                    "spec_hash": spec_hash,
+                    "checksum": checksum,
+                    "output_stat": output_stat,
+                    "variants": self._variant_entries(filename, specs)
                 }
             else:
                 manifest["images"][filename] = {
@@ -480,13 +674,338 @@ class ImageGenerator:
                 }
         
         # Save manifest
-        with open(os.path.join(self.images_dir, "manifest.json"), 'w') as f:
-            json.dump(manifest, f, indent=2)
+        atomic_write_text(os.path.join(self.images_dir, MANIFEST_FILE), json.dumps(manifest, indent=2))
+        self._built_specs = {}
         
         logging.info("✅ Generated image manifest")
 
+
+def image_spec_hash(specs: Dict) -> str:
+    """Hash of everything an image is rendered from: its spec, the renderer version and the variant formats"""
+    data = json.dumps({**specs, "renderer": RENDERER_VERSION, "formats": variant_formats()}, sort_keys=True)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def variant_formats() -> Tuple[str, ...]:
+    """Modern formats the local Pillow can write (AVIF needs Pillow 11.2+ or the pillow-avif plugin)"""
+    from PIL import Image
+    Image.init()
+    return tuple(name for name in MODERN_FORMATS if name in Image.SAVE)
+
+
+def _fallback_format(filename: str) -> str:
+    return "PNG" if filename.lower().endswith('.png') else "JPEG"
+
+
+def image_variants(filename: str, specs: Dict) -> List[Dict]:
+    """Responsive variants of an image: file name, scale, pixel size and format of each
+    
+    Named ``<stem>-<width>w.<ext>``, so a srcset can be built from the
+    manifest entries of one format. The 1x fallback is the image itself.
+    """
+    stem = os.path.splitext(filename)[0]
+    width, height = specs["size"]
+    variants = []
+    for scale in VARIANT_SCALES:
+        variant_width, variant_height = round(width * scale), round(height * scale)
+        if scale < 1 and variant_width < MOBILE_MIN_WIDTH:
+            continue
+        for image_format in variant_formats() + (_fallback_format(filename),):
+            if scale == 1 and image_format == _fallback_format(filename):
+                name = filename
+            else:
+                name = f"{stem}-{variant_width}w.{FORMAT_EXTENSIONS[image_format]}"
+            variants.append({
+                "file": name,
+                "scale": scale,
+                "width": variant_width,
+                "height": variant_height,
+                "format": image_format.lower(),
+            })
+    return variants
+
+
+def _hash_file(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def load_font(face: str, size: int):
+    """``face`` at ``size``, or Pillow's default font when it isn't installed; loaded once per process"""
+    from PIL import ImageFont
+    try:
+        return ImageFont.truetype(face, size)
+    except OSError:
+        try:
+            return ImageFont.load_default(size)
+        except TypeError:
+            # Pillow < 10.1 only has the fixed-size bitmap font
+            return ImageFont.load_default()
+
+
+class TextWrapper:
+    """Greedy word wrapping that measures each distinct word once
+    
+    A line's width is the advance of the words before its last one plus the
+    last word's ink extent, less the first word's left bearing, which is
+    what measuring the whole line with textbbox gives. Widths that land
+    within a pixel of the limit are measured for real so rounding can't
+    change where a line breaks.
+    """
+    
+    def __init__(self, font):
+        self.font = font
+        self.space = font.getlength(" ")
+        self.measurements = 0
+        self._words = {}  # word -> (advance, left, right)
+    
+    def _metrics(self, word: str) -> Tuple[float, int, int]:
+        metrics = self._words.get(word)
+        if metrics is None:
+            left, _, right, _ = self.font.getbbox(word)
+            metrics = self._words[word] = (self.font.getlength(word), left, right)
+            self.measurements += 1
+        return metrics
+    
+    def _measure(self, line: str) -> int:
+        self.measurements += 1
+        left, _, right, _ = self.font.getbbox(line)
+        return right - left
+    
+    def wrap(self, text: str, max_width: float) -> List[str]:
+        """Break ``text`` into lines no wider than ``max_width`` (a word that is wider gets a line of its own)"""
+        lines = []
+        current = []
+        advance = 0.0  # advance width of ' '.join(current)
+        left = 0
+        for word in text.split():
+            length, word_left, word_right = self._metrics(word)
+            start = advance + self.space if current else 0.0
+            line_left = left if current else word_left
+            line_width = start + word_right - line_left
+            if abs(line_width - max_width) <= 1:
+                line_width = self._measure(' '.join(current + [word]))
+            
+            current.append(word)
+            if line_width > max_width:
+                if len(current) > 1:
+                    current.pop()
+                    lines.append(' '.join(current))
+                    current = [word]
+                    advance, left = length, word_left
+                else:
+                    lines.append(word)
+                    current = []
+                    advance = 0.0
+            else:
+                advance, left = start + length, line_left
+        
+        if current:
+            lines.append(' '.join(current))
+        return lines
+
+
+@lru_cache(maxsize=None)
+def text_wrapper(face: str, size: int) -> TextWrapper:
+    """Process-wide wrapper (and word width cache) for ``face`` at ``size``"""
+    return TextWrapper(load_font(face, size))
+
+
+def _wrap_by_lines(draw, text: str, font, max_width: float) -> List[str]:
+    """Previous wrapping, measuring the whole growing line for every word; kept as the reference"""
+    lines = []
+    current_line = []
+    for word in text.split():
+        current_line.append(word)
+        bbox = draw.textbbox((0, 0), ' '.join(current_line), font=font)
+        if bbox[2] - bbox[0] > max_width:
+            if len(current_line) > 1:
+                current_line.pop()
+                lines.append(' '.join(current_line))
+                current_line = [word]
+            else:
+                lines.append(word)
+                current_line = []
+    if current_line:
+        lines.append(' '.join(current_line))
+    return lines
+
+
+def check_text_layout(generator: ImageGenerator, faces: Optional[List[str]] = None,
+                      sizes=(12, 16, 24, 36), widths=range(20, 1161, 23)) -> int:
+    """Compare TextWrapper with the previous wrapping on every description; returns the number of mismatches"""
+    from PIL import Image, ImageDraw
+    draw = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+    texts = [specs["description"] for specs in generator.required_images.values()]
+    mismatches = 0
+    for face in faces or [FONT_FACE]:
+        for size in sizes:
+            font = load_font(face, size)
+            wrapper = TextWrapper(font)
+            calls = 0
+            for text in texts:
+                calls += len(text.split())
+                for max_width in widths:
+                    expected = _wrap_by_lines(draw, text, font, max_width)
+                    if wrapper.wrap(text, max_width) != expected:
+                        mismatches += 1
+                        print(f"❌ {face} {size}px width {max_width}: {text!r} -> {expected}")
+            print(f"{face} {size}px: {len(texts) * len(widths)} layouts, "
+                  f"{calls * len(widths)} line measurements before, {wrapper.measurements} now")
+    return mismatches
+
+
+# Per-process generator used by pool workers (keeps its background canvases between images)
+_worker_generator = None
+
+
+def _render_with(generator: ImageGenerator,
+                 job: Tuple[str, Dict]) -> Tuple[str, Optional[List[Tuple[str, bytes]]], Optional[str]]:
+    filename, specs = job
+    try:
+        return filename, generator.render_placeholder_image(filename, specs), None
+    except Exception as e:
+        return filename, None, str(e)
+
+
+def _render_image(job: Tuple[str, Dict]) -> Tuple[str, Optional[List[Tuple[str, bytes]]], Optional[str]]:
+    """Pool worker: render and encode one image and its variants; returns (filename, files, error)"""
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = ImageGenerator()
+    return _render_with(_worker_generator, job)
+
+
+def _pack_rgbx(colors):
+    """Pack RGB colours (a tuple or an array of them) into RGBX words"""
+    import numpy as np
+    colors = np.asarray(colors, dtype=np.uint32)
+    return (colors[..., 0] | colors[..., 1] << 8 | colors[..., 2] << 16).astype(RGBX_DTYPE)
+
+
+def _image_from_rgbx(pixels) -> Image.Image:
+    """RGB image from a (height, width) array of RGBX words, dropping the padding in one C pass"""
+    from PIL import Image
+    height, width = pixels.shape
+    return Image.frombytes('RGB', (width, height), pixels, 'raw', 'RGBX')
+
+
+def _draw_gradient_background(width: int, height: int) -> Image.Image:
+    """Previous line-by-line gradient, kept as the benchmark baseline"""
+    from PIL import Image, ImageDraw
+    img = Image.new('RGB', (width, height), '#667eea')
+    draw = ImageDraw.Draw(img)
+    for y in range(height):
+        ratio = y / height
+        fill = tuple(int(top + (bottom - top) * ratio) for top, bottom in zip(GRADIENT_TOP, GRADIENT_BOTTOM))
+        draw.line([(0, y), (width, y)], fill=fill)
+    return img
+
+
+def _fill_grid_background(generator: ImageGenerator, width: int, height: int) -> Image.Image:
+    """Infographic grid built as a NumPy strided mask, benchmarked against the line drawing"""
+    pixels = generator._canvas(width, height)
+    pixels[:] = _pack_rgbx(INFOGRAPHIC_FILL)
+    pixels[:, ::GRID_SPACING] = _pack_rgbx(INFOGRAPHIC_GRID)
+    pixels[::GRID_SPACING, :] = _pack_rgbx(INFOGRAPHIC_GRID)
+    return _image_from_rgbx(pixels)
+
+
+def benchmark_backgrounds(generator: ImageGenerator, repeat: int = 20) -> List[Dict]:
+    """Backgrounds per second for each image size in the manifest, line drawing vs NumPy"""
+    results = []
+    sizes = sorted({tuple(specs["size"]) for specs in generator.required_images.values()}, reverse=True)
+    for width, height in sizes:
+        rates = {}
+        for name, build in (("gradient_lines", _draw_gradient_background),
+                            ("gradient_numpy", generator.create_gradient_background),
+                            ("grid_lines", generator.create_infographic_background),
+                            ("grid_numpy", lambda w, h: _fill_grid_background(generator, w, h))):
+            build(width, height)  # warm up (imports) outside the timing
+            start = time.perf_counter()
+            for _ in range(repeat):
+                build(width, height)
+            rates[name] = repeat / (time.perf_counter() - start)
+
+        results.append({"size": (width, height), **rates})
+        print(f"{width:>5}x{height:<4} gradient: {rates['gradient_lines']:8.0f} -> {rates['gradient_numpy']:8.0f} img/s  "
+              f"grid: {rates['grid_lines']:8.0f} -> {rates['grid_numpy']:8.0f} img/s")
+    return results
+
+
+# Image groups offered by the menu and ``build --group``
+IMAGE_GROUPS = {
+    'product': ['product', 'product_small', 'product_icon'],
+    'hero': ['hero_background', 'blog_header', 'article_hero'],
+    'blog': ['blog_header', 'article_hero', 'infographic'],
+    'thumbnail': ['thumbnail', 'article_thumb'],
+    'logo': ['logo', 'brand_logo']
+}
+
+
+def generate_image_group(generator: ImageGenerator, group: str, workers: Optional[int] = None,
+                         force: bool = False):
+    """Generate every required image whose type belongs to ``group``"""
+    target_types = IMAGE_GROUPS[group]
+    images = {filename: specs for filename, specs in generator.required_images.items()
+              if specs['type'] in target_types}
+    generator.generate_images(images, workers, force)
+
+
+def build_all(generator: ImageGenerator, workers: Optional[int] = None, force: bool = False) -> bool:
+    """Generate every out-of-date image (already optimized) and the favicon; the manifest is kept in step"""
+    success = generator.generate_all_images(workers, force)
+    generator.create_favicon()
+    return success
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="image-generator.py",
+        description="TechReview Hub image generation (runs the interactive menu without a command)"
+    )
+    commands = parser.add_subparsers(dest="command")
+    build_command = commands.add_parser("build", help="generate all images, or one group")
+    build_command.add_argument("--group", choices=list(IMAGE_GROUPS))
+    build_command.add_argument("--workers", type=int, help="render processes (default: one per CPU)")
+    build_command.add_argument("--force", action="store_true", help="regenerate images that are up to date")
+    commands.add_parser("favicon", help="create the favicon")
+    commands.add_parser("optimize", help="re-encode images added by hand (build output is already optimized)")
+    commands.add_parser("manifest", help="write images/manifest.json")
+    benchmark_command = commands.add_parser("benchmark", help="time background rendering at each manifest size")
+    benchmark_command.add_argument("--repeat", type=int, default=20)
+    layout_command = commands.add_parser("check-layout", help="check text wrapping against the previous layout")
+    layout_command.add_argument("--font", action="append", dest="fonts", help="font file (repeatable)")
+    return parser
+
+
+def run_command(args: argparse.Namespace) -> int:
+    """Run a non-interactive subcommand; returns the process exit code"""
+    generator = ImageGenerator()
+    if args.command == "build" and args.group:
+        generate_image_group(generator, args.group, args.workers, args.force)
+    elif args.command == "build":
+        return 0 if build_all(generator, args.workers, args.force) else 1
+    elif args.command == "favicon":
+        generator.create_favicon()
+    elif args.command == "optimize":
+        generator.optimize_images()
+    elif args.command == "manifest":
+        generator.generate_image_manifest()
+    elif args.command == "benchmark":
+        benchmark_backgrounds(generator, args.repeat)
+    elif args.command == "check-layout":
+        return 1 if check_text_layout(generator, args.fonts) else 0
+    return 0
+
+
 def main():
     """Main function to run image generation"""
+    if len(sys.argv) > 1:
+        sys.exit(run_command(build_parser().parse_args()))
+    
     print("🎨 TechReview Hub - Automated Image Generation System")
     print("==================================================")
     
@@ -504,10 +1023,7 @@ def main():
     
     if choice == '1':
         print("\n🎨 Generating all images...")
-        success = generator.generate_all_images()
-        generator.create_favicon()
-        generator.optimize_images()
-        generator.generate_image_manifest()
+        success = build_all(generator)
         
         if success:
             print("🎉 All images generated successfully!")
@@ -524,19 +1040,10 @@ def main():
         print("5. Logos")
         
         type_choice = input("Choose type (1-5): ").strip()
-        type_map = {
-            '1': ['product', 'product_small', 'product_icon'],
-            '2': ['hero_background', 'blog_header', 'article_hero'],
-            '3': ['blog_header', 'article_hero', 'infographic'],
-            '4': ['thumbnail', 'article_thumb'],
-            '5': ['logo', 'brand_logo']
-        }
+        type_map = dict(zip(['1', '2', '3', '4', '5'], IMAGE_GROUPS))
         
         if type_choice in type_map:
-            target_types = type_map[type_choice]
-            for filename, specs in generator.required_images.items():
-                if specs['type'] in target_types:
-                    generator.generate_placeholder_image(filename, specs)
+            generate_image_group(generator, type_map[type_choice])
             print(f"✅ Generated images for selected type")
         else:
             print("❌ Invalid choice")
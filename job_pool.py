@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Job Pool for TechReview Hub
+Runs scheduled jobs on a bounded worker pool with per-job concurrency limits and slow-job warnings
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from log_setup import log_context
+
+
+class JobPool:
+    """Bounded thread pool for scheduler jobs
+
+    Each job name has its own concurrency limit; a submission beyond the limit
+    is skipped rather than queued behind the running instance. A job still
+    running ``warn_after`` seconds after it started is reported once, counted
+    as slow, and counted as overdue until it returns. Nothing is cancelled:
+    Python threads can't be interrupted, so a job only ends when its blocking
+    calls do (API requests time out after llm_backends.REQUEST_TIMEOUT). Until
+    then it keeps its worker thread and its slot, which also means two copies
+    never mutate the same queue.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._lock = threading.Lock()
+        self._running = {}
+        self._deadlines = {}
+        self._overdue = set()
+        self.stats = {}
+
+    def _job_stats(self, name: str) -> Dict:
+        return self.stats.setdefault(name, {
+            "runs": 0, "failures": 0, "slow": 0, "overdue": 0, "skipped": 0,
+            "running": 0, "last_success": None, "last_duration": None, "durations": []
+        })
+
+    def submit(self, name: str, func: Callable, *args, warn_after: Optional[float] = None,
+               max_concurrent: int = 1, **kwargs) -> bool:
+        """Run ``func`` on the pool unless ``max_concurrent`` copies of ``name`` are already running"""
+        with self._lock:
+            stats = self._job_stats(name)
+            if stats["running"] >= max_concurrent:
+                stats["skipped"] += 1
+                logging.warning(f"⏭️ Skipping {name}: {stats['running']} run(s) still in progress")
+                return False
+            stats["running"] += 1
+
+        token = object()
+        if warn_after:
+            with self._lock:
+                self._deadlines[token] = (time.monotonic() + warn_after, name)
+        self._executor.submit(self._run, name, token, func, args, kwargs)
+        return True
+
+    def _run(self, name: str, token: object, func: Callable, args, kwargs):
+        start = time.monotonic()
+        ok = False
+        try:
+            with log_context(job=name):
+                func(*args, **kwargs)
+            ok = True
+        except Exception as e:
+            logging.error(f"Job {name} failed: {e}", extra={"job": name})
+        finally:
+            duration = time.monotonic() - start
+            logging.info(f"Job {name} finished in {duration:.1f}s",
+                         extra={"job": name, "duration": round(duration, 4), "ok": ok})
+            with self._lock:
+                self._deadlines.pop(token, None)
+                stats = self._job_stats(name)
+                if token in self._overdue:
+                    self._overdue.discard(token)
+                    stats["overdue"] -= 1
+                stats["running"] -= 1
+                stats["runs"] += 1
+                stats["last_duration"] = duration
+                stats["durations"] = (stats["durations"] + [duration])[-100:]
+                if ok:
+                    stats["last_success"] = time.time()
+                else:
+                    stats["failures"] += 1
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Copy of the per-job stats, safe to read while jobs are running"""
+        with self._lock:
+            return {name: {**stats, "durations": list(stats["durations"])} for name, stats in self.stats.items()}
+
+    def check_slow_jobs(self):
+        """Report jobs that have run past ``warn_after`` (each run is reported once)"""
+        now = time.monotonic()
+        with self._lock:
+            overdue = [(token, name) for token, (deadline, name) in self._deadlines.items() if deadline <= now]
+            for token, name in overdue:
+                del self._deadlines[token]
+                self._overdue.add(token)
+                stats = self._job_stats(name)
+                stats["slow"] += 1
+                stats["overdue"] += 1
+        for _, name in overdue:
+            logging.error(f"⏰ Job {name} is running longer than expected and still holds its worker")
+
+    def next_warning(self) -> Optional[float]:
+        """Seconds until the earliest running job counts as slow, if any"""
+        with self._lock:
+            if not self._deadlines:
+                return None
+            return max(0.0, min(deadline for deadline, _ in self._deadlines.values()) - time.monotonic())
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
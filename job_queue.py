@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Job Queue for TechReview Hub
+Durable SQLite-backed content queue with priorities, leases and attempt counts
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+QUEUE_DB = "content_queue.db"
+PRODUCTS = "products"
+TOPICS = "topics"
+
+
+class Job:
+    """A claimed queue item"""
+
+    def __init__(self, job_id: int, queue: str, payload: Dict, attempts: int, priority: int):
+        self.id = job_id
+        self.queue = queue
+        self.payload = payload
+        self.attempts = attempts
+        self.priority = priority
+
+
+class JobQueue:
+    """Transactional queue shared safely by several workers and processes
+
+    Claiming a job leases it to a worker; a lease that is not completed,
+    failed or extended before it expires makes the job claimable again.
+    Workers on several machines can share one database: each registers,
+    heartbeats to renew its leases, prefetches with ``claim_batch`` and steals
+    unstarted jobs from busier workers when it runs dry. WAL needs memory shared
+    between the processes of one host, so a database on a network filesystem
+    must be opened with ``shared=True`` by every machine, which uses a rollback
+    journal instead. Only the current lease holder can complete or fail a job.
+    """
+
+    def __init__(self, path: str = QUEUE_DB, shared: bool = False):
+        self.path = path
+        self.shared = shared
+        self._local = threading.local()
+        self._connection().executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                queue TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                priority INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'ready',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL DEFAULT 5,
+                available_at REAL NOT NULL,
+                lease_owner TEXT,
+                lease_expires REAL,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_ready ON jobs(queue, status, priority DESC, id);
+            CREATE INDEX IF NOT EXISTS jobs_leases ON jobs(status, lease_expires);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS workers (
+                id TEXT PRIMARY KEY,
+                info TEXT,
+                started_at REAL NOT NULL,
+                heartbeat REAL NOT NULL,
+                completed INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'alive'
+            );
+            """
+        )
+        # Queues created before work stealing lack started_at
+        columns = [row[1] for row in self._connection().execute("PRAGMA table_info(jobs)")]
+        if "started_at" not in columns:
+            self._connection().execute("ALTER TABLE jobs ADD COLUMN started_at REAL")
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread; on a local disk WAL lets readers proceed while a worker claims"""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            if self.shared:
+                db.execute("PRAGMA journal_mode=DELETE")
+                db.execute("PRAGMA synchronous=FULL")
+            else:
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction that takes the database lock up front"""
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    def put(self, queue: str, payload: Dict, priority: int = 0, max_attempts: int = 5, delay: float = 0.0) -> int:
+        """Add a job; higher priorities are claimed first, then oldest first"""
+        now = time.time()
+        with self._transaction() as db:
+            cursor = db.execute(
+                "INSERT INTO jobs (queue, payload, priority, max_attempts, available_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (queue, json.dumps(payload), priority, max_attempts, now + delay, now, now)
+            )
+            return cursor.lastrowid
+
+    def claim(self, queue: str, worker: str = "local", lease_seconds: float = 1800) -> Optional[Job]:
+        """Lease the next available job, or return None when the queue is empty"""
+        now = time.time()
+        with self._transaction() as db:
+            # Expired leases go back to ready, keeping their priority and position
+            db.execute(
+                "UPDATE jobs SET status = 'ready', lease_owner = NULL, started_at = NULL, updated_at = ? "
+                "WHERE status = 'leased' AND lease_expires <= ?",
+                (now, now)
+            )
+            row = db.execute(
+                "SELECT id, payload, attempts, priority FROM jobs "
+                "WHERE queue = ? AND status = 'ready' AND available_at <= ? "
+                "ORDER BY priority DESC, id LIMIT 1",
+                (queue, now)
+            ).fetchone()
+            if not row:
+                return None
+
+            db.execute(
+                "UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_owner = ?, "
+                "lease_expires = ?, started_at = ?, updated_at = ? WHERE id = ?",
+                (worker, now + lease_seconds, now, now, row[0])
+            )
+            return Job(row[0], queue, json.loads(row[1]), row[2] + 1, row[3])
+
+    def claim_batch(self, queue: str, worker: str, count: int, lease_seconds: float = 1800) -> List[Job]:
+        """Lease up to ``count`` jobs without starting them
+
+        Prefetched jobs stay stealable by idle workers until ``start`` is called.
+        """
+        now = time.time()
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE jobs SET status = 'ready', lease_owner = NULL, started_at = NULL, updated_at = ? "
+                "WHERE status = 'leased' AND lease_expires <= ?",
+                (now, now)
+            )
+            rows = db.execute(
+                "SELECT id, payload, attempts, priority FROM jobs "
+                "WHERE queue = ? AND status = 'ready' AND available_at <= ? "
+                "ORDER BY priority DESC, id LIMIT ?",
+                (queue, now, count)
+            ).fetchall()
+            db.executemany(
+                "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?, started_at = NULL, "
+                "updated_at = ? WHERE id = ?",
+                [(worker, now + lease_seconds, now, row[0]) for row in rows]
+            )
+        return [Job(row[0], queue, json.loads(row[1]), row[2], row[3]) for row in rows]
+
+    def start(self, job: Job, worker: str) -> bool:
+        """Begin work on a prefetched job; False when another worker stole it first"""
+        now = time.time()
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET attempts = attempts + 1, started_at = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ? AND started_at IS NULL",
+                (now, now, job.id, worker)
+            )
+            if cursor.rowcount != 1:
+                return False
+        job.attempts += 1
+        return True
+
+    def steal(self, queues: List[str], worker: str, lease_seconds: float = 1800) -> Optional[Job]:
+        """Take one prefetched, not yet started job from the worker holding the most of them
+
+        The victim's last prefetched job is taken so it keeps working in order;
+        a worker holding a single job is left alone.
+        """
+        now = time.time()
+        marks = ",".join("?" * len(queues))
+        with self._transaction() as db:
+            victim = db.execute(
+                f"SELECT lease_owner FROM jobs WHERE status = 'leased' AND started_at IS NULL "
+                f"AND queue IN ({marks}) AND lease_owner != ? "
+                f"GROUP BY lease_owner HAVING COUNT(*) > 1 ORDER BY COUNT(*) DESC LIMIT 1",
+                (*queues, worker)
+            ).fetchone()
+            if not victim:
+                return None
+            row = db.execute(
+                f"SELECT id, queue, payload, attempts, priority FROM jobs "
+                f"WHERE status = 'leased' AND started_at IS NULL AND lease_owner = ? AND queue IN ({marks}) "
+                f"ORDER BY priority, id DESC LIMIT 1",
+                (victim[0], *queues)
+            ).fetchone()
+            db.execute(
+                "UPDATE jobs SET lease_owner = ?, lease_expires = ?, updated_at = ? WHERE id = ?",
+                (worker, now + lease_seconds, now, row[0])
+            )
+        return Job(row[0], row[1], json.loads(row[2]), row[3], row[4])
+
+    def release(self, worker: str) -> int:
+        """Return a worker's prefetched, unstarted jobs to the queue (on shutdown)"""
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET status = 'ready', lease_owner = NULL, updated_at = ? "
+                "WHERE status = 'leased' AND lease_owner = ? AND started_at IS NULL",
+                (time.time(), worker)
+            )
+            return cursor.rowcount
+
+    def register_worker(self, worker: str, info: Optional[Dict] = None):
+        now = time.time()
+        with self._transaction() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO workers (id, info, started_at, heartbeat, completed, status) "
+                "VALUES (?, ?, ?, ?, 0, 'alive')",
+                (worker, json.dumps(info or {}), now, now)
+            )
+
+    def heartbeat(self, worker: str, lease_seconds: float) -> int:
+        """Mark ``worker`` alive and renew every lease it holds; returns the number of leases renewed"""
+        now = time.time()
+        with self._transaction() as db:
+            db.execute("UPDATE workers SET heartbeat = ?, status = 'alive' WHERE id = ?", (now, worker))
+            cursor = db.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE status = 'leased' AND lease_owner = ?",
+                (now + lease_seconds, worker)
+            )
+            return cursor.rowcount
+
+    def reclaim_dead(self, stale_after: float) -> int:
+        """Requeue jobs held by workers whose heartbeat is older than ``stale_after`` seconds"""
+        now = time.time()
+        with self._transaction() as db:
+            dead = [row[0] for row in db.execute(
+                "SELECT id FROM workers WHERE status = 'alive' AND heartbeat < ?", (now - stale_after,)
+            )]
+            reclaimed = 0
+            for worker in dead:
+                reclaimed += db.execute(
+                    "UPDATE jobs SET status = 'ready', lease_owner = NULL, started_at = NULL, updated_at = ? "
+                    "WHERE status = 'leased' AND lease_owner = ?",
+                    (now, worker)
+                ).rowcount
+                db.execute("UPDATE workers SET status = 'dead' WHERE id = ?", (worker,))
+            return reclaimed
+
+    def workers(self) -> List[Dict]:
+        """Registered workers with their heartbeat age and current lease count"""
+        now = time.time()
+        rows = self._connection().execute(
+            "SELECT w.id, w.status, w.heartbeat, w.completed, "
+            "(SELECT COUNT(*) FROM jobs j WHERE j.status = 'leased' AND j.lease_owner = w.id) "
+            "FROM workers w ORDER BY w.id"
+        ).fetchall()
+        return [{"id": row[0], "status": row[1], "heartbeat_age": round(now - row[2], 1),
+                 "completed": row[3], "leased": row[4]} for row in rows]
+
+    def extend_lease(self, job_id: int, worker: str, lease_seconds: float = 1800) -> bool:
+        """Heartbeat: keep a job leased; False when the lease was lost to another worker"""
+        now = time.time()
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (now + lease_seconds, now, job_id, worker)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker: str = "local") -> bool:
+        """Mark a job done; returns False if ``worker`` no longer holds its lease"""
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET status = 'done', lease_owner = NULL, updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (time.time(), job_id, worker)
+            )
+            if cursor.rowcount != 1:
+                logging.warning(f"Job {job_id} was not completed: {worker} no longer holds its lease")
+                return False
+            db.execute("UPDATE workers SET completed = completed + 1 WHERE id = ?", (worker,))
+            return True
+
+    def fail(self, job_id: int, error: str = "", retry_delay: float = 0.0, worker: str = "local") -> bool:
+        """Record a failed attempt; returns True if the job will be retried
+
+        Nothing is recorded (and False returned) if ``worker`` no longer holds the lease.
+        """
+        now = time.time()
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (job_id, worker)
+            ).fetchone()
+            if not row:
+                logging.warning(f"Failure of job {job_id} not recorded: {worker} no longer holds its lease")
+                return False
+            retry = row[0] < row[1]
+            db.execute(
+                "UPDATE jobs SET status = ?, available_at = ?, lease_owner = NULL, started_at = NULL, "
+                "last_error = ?, updated_at = ? WHERE id = ?",
+                ("ready" if retry else "failed", now + retry_delay, error, now, job_id)
+            )
+            return retry
+
+    def depth(self, queue: str) -> int:
+        """Jobs waiting or in progress"""
+        row = self._connection().execute(
+            "SELECT COUNT(*) FROM jobs WHERE queue = ? AND status IN ('ready', 'leased')", (queue,)
+        ).fetchone()
+        return row[0]
+
+    def oldest_age(self, queue: str) -> Optional[float]:
+        """Seconds since the oldest pending job was queued"""
+        row = self._connection().execute(
+            "SELECT MIN(created_at) FROM jobs WHERE queue = ? AND status IN ('ready', 'leased')", (queue,)
+        ).fetchone()
+        return time.time() - row[0] if row[0] else None
+
+    def pending(self, queue: str, limit: Optional[int] = None) -> List[Dict]:
+        """Payloads of pending jobs in claim order"""
+        sql = ("SELECT payload FROM jobs WHERE queue = ? AND status IN ('ready', 'leased') "
+               "ORDER BY priority DESC, id")
+        params = (queue,)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (queue, limit)
+        return [json.loads(row[0]) for row in self._connection().execute(sql, params)]
+
+    def stats(self, queue: str) -> Dict[str, int]:
+        rows = self._connection().execute(
+            "SELECT status, COUNT(*) FROM jobs WHERE queue = ? GROUP BY status", (queue,)
+        ).fetchall()
+        return dict(rows)
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._connection().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self._transaction() as db:
+            db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def import_json(self, queue: str, path: str) -> int:
+        """One-shot import of a legacy JSON list queue file; later calls are no-ops"""
+        marker = f"imported:{queue}"
+        if self.get_meta(marker) or not os.path.exists(path):
+            return 0
+
+        with open(path, 'r') as f:
+            items = json.load(f)
+
+        now = time.time()
+        with self._transaction() as db:
+            db.executemany(
+                "INSERT INTO jobs (queue, payload, available_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [(queue, json.dumps(item), now, now, now) for item in items]
+            )
+            db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (marker, path))
+        return len(items)
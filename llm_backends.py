@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+LLM Backends for TechReview Hub
+Pluggable chat-completion backends used by the AI content generator
+"""
+
+import asyncio
+import json
+import os
+import random
+import re
+import time
+from typing import Dict, Iterator, List, Optional
+
+# Seconds before an API request is abandoned (OPENAI_TIMEOUT overrides it);
+# a timed-out call raises and is retried like any other transient failure
+REQUEST_TIMEOUT = float(os.getenv('OPENAI_TIMEOUT', 60))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token) for requests without usage data"""
+    return max(1, len(text) // 4) if text else 0
+
+
+class RateLimitError(Exception):
+    """Rate limit reported by a backend, with the server's retry-after hint in seconds"""
+
+    status_code = 429
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMResponse:
+    """Text and token usage returned by a chat completion"""
+
+    def __init__(self, content: str, prompt_tokens: int = 0, completion_tokens: int = 0):
+        self.content = content
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+class OpenAIBackend:
+    """Chat completions served by the OpenAI API"""
+
+    def __init__(self, api_key: str, timeout: float = REQUEST_TIMEOUT):
+        """Configure the OpenAI client with the given API key"""
+        import openai
+        openai.api_key = api_key
+        self._openai = openai
+        self.timeout = timeout
+
+    def complete(self, model: str, messages: List[Dict], max_tokens: int, temperature: float) -> LLMResponse:
+        """Run a blocking chat completion"""
+        response = self._openai.ChatCompletion.create(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            request_timeout=self.timeout
+        )
+
+        usage = getattr(response, 'usage', None)
+        return LLMResponse(
+            response.choices[0].message.content,
+            prompt_tokens=getattr(usage, 'prompt_tokens', 0) if usage else 0,
+            completion_tokens=getattr(usage, 'completion_tokens', 0) if usage else 0
+        )
+
+    async def acomplete(self, model: str, messages: List[Dict], max_tokens: int, temperature: float) -> LLMResponse:
+        """Run a chat completion without blocking the event loop"""
+        return await asyncio.to_thread(self.complete, model, messages, max_tokens, temperature)
+
+    def stream(self, model: str, messages: List[Dict], max_tokens: int, temperature: float) -> Iterator[str]:
+        """Yield completion text incrementally as the API streams it"""
+        response = self._openai.ChatCompletion.create(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            request_timeout=self.timeout,
+            stream=True
+        )
+
+        for chunk in response:
+            content = getattr(chunk.choices[0].delta, 'content', None)
+            if content:
+                yield content
+
+
+class FakeLLMBackend:
+    """Offline backend that returns canned content after a simulated delay
+
+    Used to measure batch throughput and exercise the generator without
+    network access or API spend.
+    """
+
+    def __init__(self, latency: float = 0.5, jitter: float = 0.0, failure_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    def _next_delay(self) -> float:
+        return max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+
+    def _respond(self, messages: List[Dict], max_tokens: int) -> LLMResponse:
+        self.calls += 1
+        if self._random.random() < self.failure_rate:
+            raise RuntimeError("Simulated LLM failure")
+        if self._random.random() < self.rate_limit_rate:
+            raise RateLimitError("Simulated rate limit", retry_after=self.latency)
+
+        prompt = messages[-1]["content"]
+        content = self.render_content(prompt)
+        prompt_tokens = sum(estimate_tokens(m["content"]) for m in messages)
+        completion_tokens = min(max_tokens, estimate_tokens(content))
+        return LLMResponse(content, prompt_tokens, completion_tokens)
+
+    def render_content(self, prompt: str) -> str:
+        """Build a deterministic review-shaped response for a prompt
+
+        Batched prompts ("### Product N: name" blocks) get a JSON array back.
+        """
+        names = re.findall(r"^\s*### Product \d+: (.+)$", prompt, re.MULTILINE)
+        if names:
+            return json.dumps([
+                {
+                    "name": name.strip(),
+                    "introduction": f"An in-depth look at the {name.strip()}.",
+                    "design": "Solid construction with a compact footprint.",
+                    "performance": "Responsive, reliable and easy to set up.",
+                    "pros": ["Easy setup", "Great value", "Compact design", "Reliable connectivity", "Good app", "Voice control"],
+                    "cons": ["Limited bass", "Requires app"],
+                    "verdict": "A strong pick for most homes.",
+                    "rating": 4.5,
+                    "value": "Good value for the price."
+                }
+                for name in names
+            ], indent=2)
+
+        subject = prompt.strip().splitlines()[0].strip() if prompt.strip() else "this product"
+        return (
+            f"Introduction\n{subject}\n\n"
+            "Design and Build Quality\nSolid construction with a compact footprint.\n\n"
+            "Performance and Features\nResponsive, reliable and easy to set up.\n\n"
+            "Pros:\n- Easy setup\n- Great value\n- Compact design\n- Reliable connectivity\n- Good app\n- Voice control\n\n"
+            "Cons:\n- Limited bass\n- Requires app\n\n"
+            "Final Verdict\nA strong pick for most homes. Rating: 4.5/5\n"
+        )
+
+    def complete(self, model: str, messages: List[Dict], max_tokens: int, temperature: float) -> LLMResponse:
+        """Return canned content after sleeping for the simulated latency"""
+        time.sleep(self._next_delay())
+        return self._respond(messages, max_tokens)
+
+    async def acomplete(self, model: str, messages: List[Dict], max_tokens: int, temperature: float) -> LLMResponse:
+        """Return canned content after an asynchronous simulated delay"""
+        await asyncio.sleep(self._next_delay())
+        return self._respond(messages, max_tokens)
+
+    def stream(self, model: str, messages: List[Dict], max_tokens: int, temperature: float) -> Iterator[str]:
+        """Yield canned content word by word, spreading the simulated latency across chunks"""
+        delay = self._next_delay()
+        time.sleep(delay * 0.1)
+        content = self._respond(messages, max_tokens).content
+        chunks = content.split(' ')
+        for i, chunk in enumerate(chunks):
+            if i:
+                time.sleep(delay * 0.9 / len(chunks))
+            yield chunk if i == len(chunks) - 1 else chunk + ' '
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache for TechReview Hub
+Persistent, content-addressed cache of chat completions with LRU eviction and TTL
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "llm_responses.sqlite3")
+
+
+def cache_key(model: str, messages: List[Dict], temperature: float, max_tokens: int) -> str:
+    """Hash of everything that determines a completion: model, system message, prompt and sampling settings"""
+    system = "\n".join(m["content"] for m in messages if m["role"] == "system")
+    prompt = "\n".join(m["content"] for m in messages if m["role"] != "system")
+    payload = json.dumps([model, system, prompt, temperature, max_tokens], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed completion cache bounded by entry count and total bytes"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = 5000,
+                 max_bytes: int = 200 * 1024 * 1024, ttl_seconds: Optional[float] = 30 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Generous timeout: worker machines sharing an output root also share the cache
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL" if path != ":memory:" else "PRAGMA journal_mode=MEMORY")
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                prompt_tokens INTEGER NOT NULL DEFAULT 0,
+                completion_tokens INTEGER NOT NULL DEFAULT 0,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses(last_used)")
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached entry for ``key`` or None on a miss or expired entry"""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT content, prompt_tokens, completion_tokens, created_at FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+            if row and self.ttl_seconds is not None and now - row[3] > self.ttl_seconds:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                row = None
+
+            if not row:
+                self.misses += 1
+                return None
+
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+            return {"content": row[0], "prompt_tokens": row[1], "completion_tokens": row[2]}
+
+    def put(self, key: str, content: str, prompt_tokens: int = 0, completion_tokens: int = 0):
+        """Store a completion and evict least recently used entries beyond the limits"""
+        now = time.time()
+        size = len(content.encode("utf-8"))
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, content, prompt_tokens, completion_tokens, size, now, now)
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        """Drop expired entries, then the least recently used until within bounds"""
+        if self.ttl_seconds is not None:
+            cursor = self._db.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            self.evictions += cursor.rowcount
+
+        count, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            count -= 1
+            total -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current cache size"""
+        with self._lock:
+            count, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": count,
+            "bytes": total,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def close(self):
+        self._db.close()
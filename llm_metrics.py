@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+LLM Metrics for TechReview Hub
+Records latency, token usage, retries, failures and estimated cost of every LLM call
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from llm_backends import LLMResponse, estimate_tokens
+from stats_utils import percentile
+
+DEFAULT_METRICS_PATH = "llm_metrics.jsonl"
+
+# USD per 1K tokens as (prompt, completion)
+MODEL_PRICES = {
+    "gpt-4": (0.03, 0.06),
+    "gpt-4-turbo": (0.01, 0.03),
+    "gpt-4o": (0.005, 0.015),
+    "gpt-3.5-turbo": (0.0015, 0.002),
+}
+
+LATENCY_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60, 120)
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimated USD cost of a call; unknown models are priced like gpt-4"""
+    prompt_price, completion_price = MODEL_PRICES.get(model, MODEL_PRICES["gpt-4"])
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1000
+
+
+def _start_of_day() -> float:
+    return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+
+
+class LLMMetrics:
+    """Per-call records kept in memory and appended to a JSON lines file"""
+
+    def __init__(self, path: Optional[str] = DEFAULT_METRICS_PATH, max_records: int = 100000):
+        self.path = path
+        self._records = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self._load(since=_start_of_day())
+
+    def _load(self, since: float):
+        """Reload today's records so daily spend survives restarts"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if record.get("timestamp", 0) >= since:
+                        self._records.append(record)
+        except OSError:
+            pass
+
+    def record(self, kind: str, model: str, latency: float, prompt_tokens: int = 0, completion_tokens: int = 0,
+               retries: int = 0, error: Optional[str] = None, **extra) -> Dict:
+        """Record one LLM call"""
+        record = {
+            "timestamp": time.time(),
+            "kind": kind,
+            "model": model,
+            "status": "error" if error else "ok",
+            "latency": round(latency, 4),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "retries": retries,
+            "cost": round(estimate_cost(model, prompt_tokens, completion_tokens), 6),
+        }
+        if error:
+            record["error"] = error
+        record.update(extra)
+
+        with self._lock:
+            self._records.append(record)
+            if self.path:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record) + "\n")
+        return record
+
+    def records(self, since: Optional[float] = None) -> List[Dict]:
+        with self._lock:
+            return [r for r in self._records if since is None or r["timestamp"] >= since]
+
+    def summary(self, since: Optional[float] = None) -> Dict:
+        """Call counts, latency percentiles, tokens and spend (default: since midnight)"""
+        records = self.records(_start_of_day() if since is None else since)
+        latencies = [r["latency"] for r in records if r["status"] == "ok"]
+        return {
+            "calls": len(records),
+            "failures": sum(1 for r in records if r["status"] == "error"),
+            "retries": sum(r.get("retries", 0) for r in records),
+            "latency_p50": percentile(latencies, 50),
+            "latency_p95": percentile(latencies, 95),
+            "prompt_tokens": sum(r["prompt_tokens"] for r in records),
+            "completion_tokens": sum(r["completion_tokens"] for r in records),
+            "cost": sum(r["cost"] for r in records),
+        }
+
+    def daily_spend(self) -> float:
+        return self.summary()["cost"]
+
+    def export_jsonl(self, path: str, since: Optional[float] = None):
+        """Write records as JSON lines"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in self.records(since):
+                f.write(json.dumps(record) + "\n")
+
+    def export_prometheus(self, path: str):
+        """Write counters and a latency histogram in the Prometheus text format"""
+        records = self.records()
+        requests, tokens, cost, retries = {}, {}, {}, {}
+        histograms = {}
+        for r in records:
+            labels = f'model="{r["model"]}",kind="{r["kind"]}"'
+            status_labels = f'{labels},status="{r["status"]}"'
+            requests[status_labels] = requests.get(status_labels, 0) + 1
+            for token_type in ("prompt", "completion"):
+                token_labels = f'{labels},type="{token_type}"'
+                tokens[token_labels] = tokens.get(token_labels, 0) + r[f"{token_type}_tokens"]
+            cost[labels] = cost.get(labels, 0.0) + r["cost"]
+            retries[labels] = retries.get(labels, 0) + r.get("retries", 0)
+            if r["status"] == "ok":
+                histogram = histograms.setdefault(labels, {"buckets": [0] * len(LATENCY_BUCKETS), "sum": 0.0, "count": 0})
+                for i, bound in enumerate(LATENCY_BUCKETS):
+                    if r["latency"] <= bound:
+                        histogram["buckets"][i] += 1
+                histogram["sum"] += r["latency"]
+                histogram["count"] += 1
+
+        lines = [
+            "# HELP llm_requests_total LLM calls by outcome",
+            "# TYPE llm_requests_total counter",
+        ]
+        lines += [f"llm_requests_total{{{labels}}} {value}" for labels, value in requests.items()]
+        lines += ["# HELP llm_tokens_total Tokens used", "# TYPE llm_tokens_total counter"]
+        lines += [f"llm_tokens_total{{{labels}}} {value}" for labels, value in tokens.items()]
+        lines += ["# HELP llm_cost_usd_total Estimated spend in USD", "# TYPE llm_cost_usd_total counter"]
+        lines += [f"llm_cost_usd_total{{{labels}}} {value:.6f}" for labels, value in cost.items()]
+        lines += ["# HELP llm_retries_total Retried LLM calls", "# TYPE llm_retries_total counter"]
+        lines += [f"llm_retries_total{{{labels}}} {value}" for labels, value in retries.items()]
+        lines += ["# HELP llm_latency_seconds Successful call latency", "# TYPE llm_latency_seconds histogram"]
+        for labels, histogram in histograms.items():
+            for bound, count in zip(LATENCY_BUCKETS, histogram["buckets"]):
+                lines.append(f'llm_latency_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'llm_latency_seconds_bucket{{{labels},le="+Inf"}} {histogram["count"]}')
+            lines.append(f"llm_latency_seconds_sum{{{labels}}} {histogram['sum']:.4f}")
+            lines.append(f"llm_latency_seconds_count{{{labels}}} {histogram['count']}")
+
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+
+
+class MeteredBackend:
+    """Backend wrapper that records every call made through it"""
+
+    def __init__(self, backend, metrics: LLMMetrics):
+        self.backend = backend
+        self.metrics = metrics
+
+    def __getattr__(self, name):
+        return getattr(self.backend, name)
+
+    def _record(self, kind: str, model: str, start: float, response: Optional[LLMResponse] = None,
+                error: Optional[Exception] = None, **extra):
+        self.metrics.record(
+            kind, model, time.perf_counter() - start,
+            prompt_tokens=response.prompt_tokens if response else 0,
+            completion_tokens=response.completion_tokens if response else 0,
+            retries=getattr(response, "retries", 0) if response else getattr(error, "retries", 0),
+            error=f"{type(error).__name__}: {error}" if error else None,
+            **extra
+        )
+
+    def complete(self, model: str, messages: List[Dict], max_tokens: int, temperature: float) -> LLMResponse:
+        start = time.perf_counter()
+        try:
+            response = self.backend.complete(model, messages, max_tokens, temperature)
+        except Exception as e:
+            self._record("complete", model, start, error=e)
+            raise
+        self._record("complete", model, start, response)
+        return response
+
+    async def acomplete(self, model: str, messages: List[Dict], max_tokens: int, temperature: float) -> LLMResponse:
+        start = time.perf_counter()
+        try:
+            response = await self.backend.acomplete(model, messages, max_tokens, temperature)
+        except Exception as e:
+            self._record("complete", model, start, error=e)
+            raise
+        self._record("complete", model, start, response)
+        return response
+
+    def stream(self, model: str, messages: List[Dict], max_tokens: int, temperature: float) -> Iterator[str]:
+        """Stream through the wrapped backend; tokens are estimated as streams carry no usage"""
+        start = time.perf_counter()
+        first_token = None
+        characters = 0
+        try:
+            for chunk in self.backend.stream(model, messages, max_tokens, temperature):
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                characters += len(chunk)
+                yield chunk
+        except Exception as e:
+            self._record("stream", model, start, error=e)
+            raise
+
+        response = LLMResponse(
+            "",
+            prompt_tokens=sum(estimate_tokens(m["content"]) for m in messages),
+            completion_tokens=characters // 4
+        )
+        self._record("stream", model, start, response, time_to_first_token=round(first_token or 0.0, 4))
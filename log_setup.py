@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Logging Setup for TechReview Hub
+Shared non-blocking logging: callers enqueue records, a background listener writes
+rotating JSON lines to the log file and readable lines to the console
+"""
+
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+from contextlib import contextmanager
+from datetime import datetime
+
+CONSOLE_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+MAX_BYTES = 10 * 1024 * 1024
+BACKUP_COUNT = 5
+
+# Fields attached to every record logged inside log_context() (job name, job id, ...)
+_context = contextvars.ContextVar("log_context", default={})
+
+# Attributes every LogRecord has; anything else came from ``extra`` or the context
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener = None
+
+
+@contextmanager
+def log_context(**fields):
+    """Attach ``fields`` (e.g. ``job="daily_review", job_id=42``) to records logged in this block"""
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Copy the current log_context() fields onto each record on the caller's thread"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for key, value in _context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves all formatting, tracebacks included, to the listener thread
+
+    The stock ``prepare`` formats each record on the caller's thread and folds
+    the traceback into the message, so the JSON ``exception`` field stayed
+    empty. Only the message arguments are merged here, so objects changed
+    after the call can't alter what gets logged.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the message, level, thread and any extra fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def setup_logging(log_file: str, level: int = logging.INFO, console: bool = True,
+                  max_bytes: int = MAX_BYTES, backup_count: int = BACKUP_COUNT) -> logging.handlers.QueueListener:
+    """Route the root logger through a queue to a background writer thread
+
+    ``log_file`` receives JSON lines and rotates at ``max_bytes``. Safe to call
+    more than once: later calls return the listener that is already running.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    file_handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count,
+                                                        encoding='utf-8')
+    file_handler.setFormatter(JsonFormatter())
+    handlers = [file_handler]
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        handlers.append(console_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Output Writer for TechReview Hub
+Crash-safe writes for generated files: temporary file, fsync, rename, with directory fsyncs batched across groups of files
+"""
+
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+from stats_utils import percentile
+
+FILE_MODE = 0o644
+LATENCY_SAMPLES = 1000
+
+# (temporary path, final path, on_commit callback, time the write started)
+_Staged = Tuple[str, str, Optional[Callable[[str], None]], float]
+
+
+def _fsync_path(path: str, flags: int = os.O_RDONLY):
+    fd = os.open(path, flags)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class OutputWriter:
+    """Atomic file writes with optional batching of the commits
+
+    Every file is written to a temporary file next to its target and renamed
+    into place, so a crash leaves either the old file or the new one, never a
+    truncated one. Outside a batch each write is durable when it returns.
+    Inside ``batch()`` files are staged and committed together. Each staged
+    file still gets its own fsync, but the renames wait until all of them are
+    synced, and each directory is then synced once for the whole batch rather
+    than once per file.
+
+    Batches belong to the writer, not the thread: give each component that
+    batches its own writer so unrelated writes aren't held back.
+    """
+
+    def __init__(self, durable: bool = True):
+        self.durable = durable
+        self._lock = threading.Lock()
+        self._staged: List[_Staged] = []
+        self._depth = 0
+        self._max_files = None
+        self._max_delay = None
+        self._first_staged = None
+        self._counts = {"files": 0, "bytes": 0, "batches": 0, "fsyncs": 0, "failed": 0}
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def write_text(self, path: str, text: str, on_commit: Optional[Callable[[str], None]] = None):
+        self.write_bytes(path, text.encode('utf-8'), on_commit)
+
+    def write_bytes(self, path: str, data: bytes, on_commit: Optional[Callable[[str], None]] = None):
+        """Write ``data`` to ``path`` atomically
+
+        ``on_commit(path)`` runs once the file is in place, which inside a batch
+        is when the batch commits rather than when this call returns.
+        """
+        started = time.perf_counter()
+        tmp_path = self._write_temp(path, data)
+        entry = (tmp_path, path, on_commit, started)
+        with self._lock:
+            self._counts["bytes"] += len(data)
+            batched = self._depth > 0
+            if batched:
+                self._staged.append(entry)
+                if self._first_staged is None:
+                    self._first_staged = time.monotonic()
+                full = self._max_files is not None and len(self._staged) >= self._max_files
+        if not batched:
+            self._commit([entry])
+        elif full:
+            self.commit()
+
+    def _write_temp(self, path: str, data: bytes) -> str:
+        directory = os.path.dirname(path) or "."
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            # mkstemp creates files only the owner can read; pages are served to everyone
+            try:
+                mode = os.stat(path).st_mode & 0o777
+            except OSError:
+                mode = FILE_MODE
+            os.chmod(tmp_path, mode)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        return tmp_path
+
+    def _commit(self, entries: List[_Staged]):
+        """Sync each staged file, rename them into place and sync each directory once"""
+        fsyncs = 0
+        renamed = 0
+        try:
+            if self.durable:
+                for tmp_path, _, _, _ in entries:
+                    _fsync_path(tmp_path)
+                    fsyncs += 1
+            for tmp_path, path, _, _ in entries:
+                os.replace(tmp_path, path)
+                renamed += 1
+            if self.durable:
+                for directory in {os.path.dirname(path) or "." for _, path, _, _ in entries}:
+                    _fsync_path(directory, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+                    fsyncs += 1
+        except BaseException:
+            for tmp_path, _, _, _ in entries[renamed:]:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            with self._lock:
+                self._counts["failed"] += len(entries) - renamed
+            raise
+        finally:
+            now = time.perf_counter()
+            with self._lock:
+                self._counts["files"] += renamed
+                self._counts["fsyncs"] += fsyncs
+                self._counts["batches"] += 1
+                self._latencies.extend(now - started for _, _, _, started in entries[:renamed])
+
+        for _, path, on_commit, _ in entries:
+            if on_commit:
+                on_commit(path)
+
+    def commit(self) -> int:
+        """Commit every staged file now; returns how many were committed"""
+        with self._lock:
+            entries, self._staged = self._staged, []
+            self._first_staged = None
+        if entries:
+            self._commit(entries)
+        return len(entries)
+
+    def commit_if_due(self) -> int:
+        """Commit when the oldest staged file has waited ``max_delay`` seconds"""
+        with self._lock:
+            due = (self._first_staged is not None and self._max_delay is not None
+                   and time.monotonic() - self._first_staged >= self._max_delay)
+        return self.commit() if due else 0
+
+    @contextmanager
+    def batch(self, max_files: Optional[int] = None, max_delay: Optional[float] = None):
+        """Stage writes made in this block and commit them together when it ends
+
+        A long-running batch commits early once ``max_files`` are staged, or
+        ``max_delay`` seconds after the first one when the caller polls
+        ``commit_if_due()``, so finished pages don't stay invisible for long.
+        Files staged before an exception are complete and still committed.
+        Nested batches join the outermost one.
+        """
+        with self._lock:
+            self._depth += 1
+            if self._depth == 1:
+                self._max_files, self._max_delay = max_files, max_delay
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._depth -= 1
+                outermost = self._depth == 0
+            if outermost:
+                self.commit()
+
+    def stats(self) -> Dict:
+        """Files and bytes written, syncs issued and write-to-durable latency in seconds"""
+        with self._lock:
+            latencies = list(self._latencies)
+            return {
+                **self._counts,
+                "pending": len(self._staged),
+                "latency_p50": percentile(latencies, 50),
+                "latency_p95": percentile(latencies, 95),
+            }
+
+
+# Unbatched writer for one-off files (homepage, manifests, status, queue snapshots)
+_default_writer = OutputWriter()
+
+
+def atomic_write_text(path: str, text: str):
+    """Write ``text`` to a temporary file next to ``path``, sync it and rename it into place"""
+    _default_writer.write_text(path, text)
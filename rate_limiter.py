@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter for TechReview Hub
+Process-wide request/token buckets and jittered retries for LLM API calls
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+from llm_backends import LLMResponse, estimate_tokens
+
+RETRYABLE_ERRORS = (
+    "RateLimitError", "APIError", "APIConnectionError", "Timeout", "APITimeoutError",
+    "ServiceUnavailableError", "InternalServerError", "TryAgain",
+)
+
+# Rate limits reported within this many seconds of a backoff (or within its
+# retry-after pause) are the same overload and don't lower the rate again
+BACKOFF_WINDOW = 1.0
+
+
+class TokenBucket:
+    """Token bucket with reservations: callers take tokens now and wait off any deficit"""
+
+    def __init__(self, per_minute: float):
+        self.limit = per_minute
+        self.rate = per_minute
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate / 60)
+        self.updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take ``amount`` tokens and return seconds to wait before using them"""
+        self._refill(now)
+        self.tokens -= amount
+        return 0.0 if self.tokens >= 0 else -self.tokens * 60 / self.rate
+
+    def refund(self, amount: float):
+        self.tokens = min(self.rate, self.tokens + amount)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits shared by every caller
+
+    The effective rate backs off multiplicatively when the API reports a rate
+    limit and creeps back towards the configured limit on success.
+    """
+
+    def __init__(self, rpm: float = 500, tpm: float = 300000):
+        self.requests = TokenBucket(rpm)
+        self.token_bucket = TokenBucket(tpm)
+        self.blocked_until = 0.0
+        self.backoff_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int) -> float:
+        """Reserve one request and ``tokens`` tokens; returns seconds the caller must wait"""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(self.requests.reserve(1, now), self.token_bucket.reserve(tokens, now))
+            return max(wait, self.blocked_until - now)
+
+    def acquire(self, tokens: int):
+        """Block until a request using ``tokens`` tokens may be sent"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int):
+        """Asynchronously wait until a request using ``tokens`` tokens may be sent"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def refund(self, tokens: int):
+        """Return tokens reserved but not used by a finished or failed request"""
+        if tokens > 0:
+            with self._lock:
+                self.token_bucket.refund(tokens)
+
+    def on_rate_limited(self, retry_after: Optional[float]):
+        """Pause every caller for ``retry_after`` seconds and lower the effective rate once per window"""
+        with self._lock:
+            now = time.monotonic()
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+            if now < self.backoff_until:
+                return
+            self.backoff_until = max(self.blocked_until, now + BACKOFF_WINDOW)
+            for bucket in (self.requests, self.token_bucket):
+                bucket.rate = max(bucket.limit * 0.1, bucket.rate * 0.75)
+
+    def on_success(self):
+        with self._lock:
+            for bucket in (self.requests, self.token_bucket):
+                bucket.rate = min(bucket.limit, bucket.rate + bucket.limit * 0.02)
+
+
+_shared_limiter = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_limiter() -> RateLimiter:
+    """Limiter shared by all generators in the process (OPENAI_RPM / OPENAI_TPM override the defaults)"""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter(
+                rpm=float(os.getenv('OPENAI_RPM', 500)),
+                tpm=float(os.getenv('OPENAI_TPM', 300000))
+            )
+        return _shared_limiter
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter that honours retry-after hints"""
+
+    def __init__(self, max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 60.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def is_retryable(self, error: Exception) -> bool:
+        status = getattr(error, 'http_status', None) or getattr(error, 'status_code', None)
+        if status:
+            return status == 429 or status >= 500
+        return type(error).__name__ in RETRYABLE_ERRORS
+
+    def retry_after(self, error: Exception) -> Optional[float]:
+        """Seconds the API asked us to wait, from the error or its response headers"""
+        hint = getattr(error, 'retry_after', None)
+        if hint is not None:
+            return float(hint)
+
+        headers = getattr(error, 'headers', None) or getattr(getattr(error, 'response', None), 'headers', None) or {}
+        try:
+            if headers.get('retry-after-ms'):
+                return float(headers['retry-after-ms']) / 1000
+            if headers.get('retry-after'):
+                return float(headers['retry-after'])
+        except (TypeError, ValueError):
+            pass
+        return None
+
+    def delay(self, attempt: int, error: Exception) -> float:
+        """Delay before retry number ``attempt`` (starting at 1)"""
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        hint = self.retry_after(error)
+        return max(backoff, hint) if hint is not None else backoff
+
+    def is_rate_limit(self, error: Exception) -> bool:
+        status = getattr(error, 'http_status', None) or getattr(error, 'status_code', None)
+        return status == 429 or type(error).__name__ == "RateLimitError"
+
+
+class RateLimitedBackend:
+    """Backend wrapper that waits for the shared limiter and retries transient failures"""
+
+    def __init__(self, backend, limiter: Optional[RateLimiter] = None, policy: Optional[RetryPolicy] = None):
+        self.backend = backend
+        self.limiter = limiter or get_shared_limiter()
+        self.policy = policy or RetryPolicy()
+
+    def __getattr__(self, name):
+        return getattr(self.backend, name)
+
+    def _budget(self, messages: List[Dict], max_tokens: int) -> int:
+        """Tokens a request counts against the limit before its real usage is known"""
+        return sum(estimate_tokens(m["content"]) for m in messages) + max_tokens
+
+    def _settle(self, budget: int, response: LLMResponse, retries: int) -> LLMResponse:
+        self.limiter.on_success()
+        if response.total_tokens:
+            self.limiter.refund(budget - response.total_tokens)
+        response.retries = retries
+        return response
+
+    def _should_retry(self, error: Exception, attempt: int) -> bool:
+        if attempt > self.policy.max_retries or not self.policy.is_retryable(error):
+            error.retries = attempt - 1
+            return False
+        if self.policy.is_rate_limit(error):
+            self.limiter.on_rate_limited(self.policy.retry_after(error))
+        return True
+
+    def complete(self, model: str, messages: List[Dict], max_tokens: int, temperature: float) -> LLMResponse:
+        budget = self._budget(messages, max_tokens)
+        attempt = 0
+        while True:
+            attempt += 1
+            self.limiter.acquire(budget)
+            try:
+                response = self.backend.complete(model, messages, max_tokens, temperature)
+                return self._settle(budget, response, attempt - 1)
+            except Exception as e:
+                # A failed call used none of its budget; the retry reserves it again
+                self.limiter.refund(budget)
+                if not self._should_retry(e, attempt):
+                    raise
+                time.sleep(self.policy.delay(attempt, e))
+
+    async def acomplete(self, model: str, messages: List[Dict], max_tokens: int, temperature: float) -> LLMResponse:
+        budget = self._budget(messages, max_tokens)
+        attempt = 0
+        while True:
+            attempt += 1
+            await self.limiter.aacquire(budget)
+            try:
+                response = await self.backend.acomplete(model, messages, max_tokens, temperature)
+                return self._settle(budget, response, attempt - 1)
+            except Exception as e:
+                self.limiter.refund(budget)
+                if not self._should_retry(e, attempt):
+                    raise
+                await asyncio.sleep(self.policy.delay(attempt, e))
+
+    def stream(self, model: str, messages: List[Dict], max_tokens: int, temperature: float) -> Iterator[str]:
+        """Stream with retries for failures that happen before the first chunk"""
+        budget = self._budget(messages, max_tokens)
+        attempt = 0
+        while True:
+            attempt += 1
+            self.limiter.acquire(budget)
+            started = False
+            try:
+                for chunk in self.backend.stream(model, messages, max_tokens, temperature):
+                    started = True
+                    yield chunk
+                self.limiter.on_success()
+                return
+            except Exception as e:
+                if started:
+                    raise
+                self.limiter.refund(budget)
+                if not self._should_retry(e, attempt):
+                    raise
+                time.sleep(self.policy.delay(attempt, e))
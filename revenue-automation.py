@@ -5,10 +5,10 @@ Collects revenue from all sources and transfers to MTN Mobile Money automaticall
 Target: MTN Mobile Number 0543936684 (Ghana)
 """
 
-import requests
+import argparse
 import json
 import logging
-import schedule
+import sys
 import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
@@ -16,15 +16,12 @@ import os
 import hashlib
 import hmac
 
+from log_setup import setup_logging
+
+# requests and schedule are imported where they are used so the menu and CLI start fast
+
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('revenue_automation.log'),
-        logging.StreamHandler()
-    ]
-)
+setup_logging('revenue_automation.log')
 
 class RevenueCollector:
     def __init__(self):
@@ -199,6 +196,7 @@ class RevenueCollector:
     
     def convert_to_ghana_cedis(self, usd_amount: float) -> float:
         """Convert USD to Ghana Cedis"""
+        import requests
         try:
             # Get current exchange rate
             response = requests.get(f"{self.config['exchange_rate']['base_url']}/USD")
@@ -244,6 +242,7 @@ class RevenueCollector:
     
     def _execute_mtn_transfer(self, amount_ghs: float) -> bool:
         """Execute MTN Mobile Money transfer"""
+        import requests
         try:
             # MTN Mobile Money API endpoint
             url = f"{self.config['mtn_momo']['base_url']}/collection/v1_0/requesttopay"
@@ -286,6 +285,7 @@ class RevenueCollector:
     
     def _verify_mtn_transfer(self, transaction_id: str) -> bool:
         """Verify MTN transfer completion"""
+        import requests
         try:
             # Wait a moment for processing
             time.sleep(5)
@@ -366,6 +366,7 @@ class RevenueCollector:
     
     def _get_paypal_access_token(self) -> Optional[str]:
         """Get PayPal access token"""
+        import requests
         try:
             url = "https://api.paypal.com/v1/oauth2/token"
             
@@ -395,6 +396,7 @@ class RevenueCollector:
     
     def _get_paypal_balance(self, access_token: str) -> float:
         """Get PayPal account balance"""
+        import requests
         try:
             url = "https://api.paypal.com/v1/reporting/balances"
             
@@ -422,6 +424,7 @@ class RevenueCollector:
     
     def _get_mtn_access_token(self) -> str:
         """Get MTN Mobile Money access token"""
+        import requests
         try:
             url = f"{self.config['mtn_momo']['base_url']}/collection/token/"
             
@@ -493,8 +496,56 @@ class RevenueCollector:
         """Send error notification"""
         logging.error(f"📱 ERROR: {error}")
 
+def run_biweekly_schedule(collector: RevenueCollector):
+    """Collect now, then every two weeks until interrupted"""
+    import schedule
+    
+    # Schedule biweekly collection
+    schedule.every(2).weeks.at("09:00").do(collector.automated_biweekly_collection)
+    
+    # Also run immediately for testing
+    collector.automated_biweekly_collection()
+    
+    # Keep running
+    while True:
+        try:
+            schedule.run_pending()
+            time.sleep(3600)  # Check every hour
+        except KeyboardInterrupt:
+            print("\n🛑 Automation stopped by user")
+            break
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="revenue-automation.py",
+        description="TechReview Hub revenue collection (runs the interactive menu without a command)"
+    )
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("start", help="collect now and then every two weeks")
+    commands.add_parser("collect", help="collect revenue once")
+    transfer = commands.add_parser("test-transfer", help="send a small test transfer")
+    transfer.add_argument("--amount", type=float, default=1.00, help="amount in USD")
+    return parser
+
+
+def run_command(args: argparse.Namespace) -> int:
+    """Run a non-interactive subcommand; returns the process exit code"""
+    collector = RevenueCollector()
+    if args.command == "start":
+        run_biweekly_schedule(collector)
+    elif args.command == "collect":
+        collector.automated_biweekly_collection()
+    elif args.command == "test-transfer":
+        return 0 if collector.transfer_to_mtn_mobile_money(args.amount) else 1
+    return 0
+
+
 def main():
     """Main function to run revenue automation"""
+    if len(sys.argv) > 1:
+        sys.exit(run_command(build_parser().parse_args()))
+    
     print("💰 TechReview Hub - Automated Revenue Collection System")
     print("=====================================================")
     print(f"🎯 Target MTN Number: 0543936684")
@@ -518,21 +569,7 @@ def main():
         print("📅 Schedule: Every 2 weeks at 9:00 AM")
         print("💸 Auto-transfer to MTN: 0543936684")
         print("Press Ctrl+C to stop")
-        
-        # Schedule biweekly collection
-        schedule.every(2).weeks.at("09:00").do(collector.automated_biweekly_collection)
-        
-        # Also run immediately for testing
-        collector.automated_biweekly_collection()
-        
-        # Keep running
-        while True:
-            try:
-                schedule.run_pending()
-                time.sleep(3600)  # Check every hour
-            except KeyboardInterrupt:
-                print("\n🛑 Automation stopped by user")
-                break
+        run_biweekly_schedule(collector)
     
     elif choice == '2':
         print("\n💰 Manual revenue collection starting...")
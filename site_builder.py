@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Site Builder for TechReview Hub
+Re-renders every generated review/blog page from cached AI content across a process pool
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from content_parser import calculate_rating, parse_sections
+from output_writer import OutputWriter, atomic_write_text
+from template_engine import (BLOG_SLOTS, BLOG_TEMPLATE, REVIEW_SLOTS, REVIEW_TEMPLATE, TemplateCache,
+                             blog_values, review_values)
+
+CONTENT_DIR = "generated_content"
+MANIFEST_FILE = ".build-manifest.json"
+STYLESHEET = "styles.css"
+
+# Per-process template cache and output writer used by pool workers
+_worker_templates = None
+_worker_writer = None
+
+
+def save_page_source(source: Dict, content_dir: str = CONTENT_DIR):
+    """Store the inputs a page was rendered from so it can be rebuilt without the LLM"""
+    os.makedirs(content_dir, exist_ok=True)
+    path = os.path.join(content_dir, source["filename"] + ".json")
+    atomic_write_text(path, json.dumps(source, indent=2, ensure_ascii=False))
+
+
+def load_page_sources(content_dir: str = CONTENT_DIR) -> List[Dict]:
+    """Load every stored page source"""
+    if not os.path.isdir(content_dir):
+        return []
+
+    sources = []
+    for name in sorted(os.listdir(content_dir)):
+        if name.endswith(".json"):
+            with open(os.path.join(content_dir, name), 'r', encoding='utf-8') as f:
+                sources.append(json.load(f))
+    return sources
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class BuildManifest:
+    """Hashes of the inputs and output of every built page
+
+    A page is fresh when its source, template and stylesheet hashes match the
+    recorded ones and the output file is unchanged since it was written.
+    """
+
+    def __init__(self, path: str = MANIFEST_FILE):
+        self.path = path
+        self.pages = {}
+        self._file_hashes = {}
+        self._dirty = False
+        self._last_save = 0.0
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.pages = json.load(f).get("pages", {})
+            except (OSError, ValueError):
+                self.pages = {}
+
+    def file_hash(self, path: str) -> Optional[str]:
+        """Content hash of a file, memoised by mtime and size (None when missing)"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._file_hashes.get(path)
+        if cached and cached[0] == version:
+            return cached[1]
+        with open(path, 'rb') as f:
+            digest = _sha256(f.read())
+        self._file_hashes[path] = (version, digest)
+        return digest
+
+    def page_inputs(self, source: Dict, template_dir: str = ".") -> Dict[str, Optional[str]]:
+        """Hashes of everything a page is built from"""
+        template = REVIEW_TEMPLATE if source["kind"] == "review" else BLOG_TEMPLATE
+        return {
+            "source": _sha256(json.dumps(source, sort_keys=True, ensure_ascii=False).encode('utf-8')),
+            "template": self.file_hash(os.path.join(template_dir, template)),
+            "styles": self.file_hash(os.path.join(template_dir, STYLESHEET)),
+        }
+
+    def is_fresh(self, filename: str, inputs: Dict, output_path: str) -> bool:
+        entry = self.pages.get(filename)
+        if not entry or entry["inputs"] != inputs:
+            return False
+        try:
+            stat = os.stat(output_path)
+        except OSError:
+            return False
+        if [stat.st_mtime_ns, stat.st_size] == entry.get("output_stat"):
+            return True
+        return self.file_hash(output_path) == entry["output"]
+
+    def record(self, filename: str, inputs: Dict, output_path: str):
+        """Record a page that was just written to ``output_path``"""
+        stat = os.stat(output_path)
+        with self._lock:
+            self.pages[filename] = {
+                "inputs": inputs,
+                "output": self.file_hash(output_path),
+                "output_stat": [stat.st_mtime_ns, stat.st_size],
+            }
+            self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            atomic_write_text(self.path, json.dumps({"pages": self.pages}, indent=1, sort_keys=True))
+            self._dirty = False
+            self._last_save = time.monotonic()
+
+    def save_if_due(self, interval: float = 2.0):
+        """Save at most every ``interval`` seconds so large batches don't rewrite the manifest per page"""
+        if self._dirty and time.monotonic() - self._last_save >= interval:
+            self.save()
+
+
+def find_stale_pages(sources: List[Dict], manifest: BuildManifest, output_dir: str = ".",
+                     template_dir: str = ".") -> List[Tuple[Dict, Dict]]:
+    """(source, inputs) for every page whose inputs or output changed since it was built"""
+    stale = []
+    for source in sources:
+        inputs = manifest.page_inputs(source, template_dir)
+        if not manifest.is_fresh(source["filename"], inputs, os.path.join(output_dir, source["filename"])):
+            stale.append((source, inputs))
+    return stale
+
+
+def render_page(source: Dict, templates: TemplateCache) -> str:
+    """Render a page from its stored source"""
+    if source["kind"] == "review":
+        sections = source.get("sections") or parse_sections(source.get("ai_content", ""))
+        rating = calculate_rating(sections.get('pros', []), sections.get('cons', []))
+        template = templates.get(REVIEW_TEMPLATE, REVIEW_SLOTS)
+        return template.render(review_values(source["product"], rating))
+
+    template = templates.get(BLOG_TEMPLATE, BLOG_SLOTS)
+    return template.render(blog_values(source["topic"], source["keywords"], source["date"]))
+
+
+def _render_chunk(jobs: List[Tuple[Dict, str, str]]) -> Tuple[List[Tuple[str, int, Optional[str]]], int]:
+    """Pool worker: render a chunk of pages and commit them as one write batch
+
+    Returns ((filename, bytes, error) per page, fsyncs issued).
+    """
+    global _worker_templates, _worker_writer
+    if _worker_writer is None:
+        _worker_writer = OutputWriter()
+    fsyncs = _worker_writer.stats()["fsyncs"]
+    results = []
+    try:
+        with _worker_writer.batch():
+            for source, output_dir, template_dir in jobs:
+                if _worker_templates is None or _worker_templates.base_dir != template_dir:
+                    _worker_templates = TemplateCache(template_dir)
+                try:
+                    data = render_page(source, _worker_templates).encode('utf-8')
+                    _worker_writer.write_bytes(os.path.join(output_dir, source["filename"]), data)
+                    results.append((source["filename"], len(data), None))
+                except Exception as e:
+                    results.append((source["filename"], 0, str(e)))
+    except Exception as e:
+        # The commit failed: none of the chunk's pages can be trusted to be in place
+        results = [(filename, 0, error or str(e)) for filename, _, error in results]
+    return results, _worker_writer.stats()["fsyncs"] - fsyncs
+
+
+def rebuild_site(output_dir: str = ".", content_dir: str = CONTENT_DIR, template_dir: str = ".",
+                 workers: Optional[int] = None, sources: Optional[List[Dict]] = None,
+                 incremental: bool = True) -> Dict:
+    """Re-render stale pages (every page when ``incremental`` is False) in parallel and report throughput"""
+    sources = load_page_sources(content_dir) if sources is None else sources
+    manifest = BuildManifest(os.path.join(output_dir, MANIFEST_FILE))
+    if incremental:
+        stale = find_stale_pages(sources, manifest, output_dir, template_dir)
+    else:
+        stale = [(source, manifest.page_inputs(source, template_dir)) for source in sources]
+    inputs_by_filename = {source["filename"]: inputs for source, inputs in stale}
+    jobs = [(source, output_dir, template_dir) for source, _ in stale]
+    workers = workers or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    if workers == 1 or len(jobs) < 2:
+        chunks = [_render_chunk(jobs)] if jobs else []
+    else:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(_render_chunk, [jobs[i:i + chunksize]
+                                                        for i in range(0, len(jobs), chunksize)]))
+    results = [result for chunk, _ in chunks for result in chunk]
+    elapsed = time.perf_counter() - start
+
+    failed = [(filename, error) for filename, _, error in results if error]
+    for filename, error in failed:
+        print(f"❌ Failed to rebuild {filename}: {error}")
+    for filename, _, error in results:
+        if not error:
+            manifest.record(filename, inputs_by_filename[filename], os.path.join(output_dir, filename))
+    manifest.save()
+
+    pages = len(results) - len(failed)
+    return {
+        "pages": pages,
+        "skipped": len(sources) - len(stale),
+        "failed": len(failed),
+        "bytes": sum(size for _, size, _ in results),
+        "fsyncs": sum(fsyncs for _, fsyncs in chunks),
+        "seconds": elapsed,
+        "pages_per_second": pages / elapsed if elapsed else 0.0,
+        "workers": workers
+    }
+
+
+def main():
+    """Rebuild the site from cached AI content"""
+    print("🏗️ TechReview Hub Site Builder")
+    print("=====================================")
+
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    workers = int(args[0]) if args else None
+    stats = rebuild_site(workers=workers, incremental='--full' not in sys.argv)
+    print(f"✅ Rebuilt {stats['pages']} pages ({stats['skipped']} up to date, {stats['failed']} failed) "
+          f"in {stats['seconds']:.2f}s with {stats['workers']} workers: {stats['pages_per_second']:.1f} pages/s, "
+          f"{stats['bytes'] / 1024:.0f} KB in {stats['fsyncs']} fsyncs")
+
+
+if __name__ == "__main__":
+    main()
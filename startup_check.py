@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Startup Check for TechReview Hub
+Measures import time of the command line scripts with ``python -X importtime`` and enforces a budget
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Sequence, Tuple
+
+# Milliseconds of imports each script may spend before its command line is parsed
+STARTUP_BUDGETS = {
+    "automation-scheduler.py": 150,
+    "image-generator.py": 100,
+    "revenue-automation.py": 100,
+}
+# Command lines measured against each script's budget (``--help`` when not listed)
+STARTUP_COMMANDS = {
+    "automation-scheduler.py": [["--help"], ["queue", "list"]],
+}
+# Modules that must not be imported just to parse the command line
+HEAVY_MODULES = ["openai", "PIL", "requests", "schedule", "numpy", "ai_content_generator"]
+
+
+def measure_imports(script: str, args: Sequence[str] = ("--help",), runs: int = 3) -> Tuple[float, List[str]]:
+    """Best-of-``runs`` total import time in ms for ``script args`` and every module it imported"""
+    best = None
+    modules = []
+    for _ in range(runs):
+        # Run from a scratch directory so the log files and queue database the
+        # scripts create don't land in the repo
+        with tempfile.TemporaryDirectory() as scratch:
+            result = subprocess.run(
+                [sys.executable, "-X", "importtime", os.path.abspath(script), *args],
+                capture_output=True, text=True, cwd=scratch
+            )
+        total = 0
+        modules = []
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            # Top-level imports are not indented; their cumulative time covers their children
+            if not name.startswith("  "):
+                total += int(cumulative)
+            # Nested imports count too: a heavy module pulled in by a light one is still paid for
+            modules.append(name.strip())
+        best = total if best is None else min(best, total)
+    return best / 1000, modules
+
+
+def check_startup(budgets: Dict[str, int] = STARTUP_BUDGETS, base_dir: str = ".") -> List[str]:
+    """Problems found: scripts over budget or importing heavy modules at startup"""
+    problems = []
+    for script, budget in budgets.items():
+        for args in STARTUP_COMMANDS.get(script, [["--help"]]):
+            command = " ".join([script, *args])
+            elapsed, modules = measure_imports(os.path.join(base_dir, script), args)
+            heavy = sorted({name.split(".")[0] for name in modules if name.split(".")[0] in HEAVY_MODULES})
+            status = "✅" if elapsed <= budget and not heavy else "❌"
+            print(f"{status} {command}: {elapsed:.1f} ms of imports (budget {budget} ms)")
+            if elapsed > budget:
+                problems.append(f"{command} imports take {elapsed:.1f} ms, over the {budget} ms budget")
+            if heavy:
+                problems.append(f"{command} imports {', '.join(heavy)} at startup")
+    return problems
+
+
+def main():
+    """Exit non-zero when any script is over its startup budget"""
+    print("⏱️ TechReview Hub Startup Check")
+    print("=====================================")
+    problems = check_startup(base_dir=os.path.dirname(os.path.abspath(__file__)))
+    for problem in problems:
+        print(f"❌ {problem}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+Statistics Helpers for TechReview Hub
+Small summary statistics shared by the metrics, status and output modules
+"""
+
+import math
+from typing import List, Optional
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of ``values`` (None when empty)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = min(len(ordered), max(1, math.ceil(pct / 100 * len(ordered))))
+    return ordered[rank - 1]
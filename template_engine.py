@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Template Engine for TechReview Hub
+Preloads HTML templates, pre-splits them into literal/slot segments and reloads them when edited
+"""
+
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Sample text in the page templates and the slot that replaces it, in replacement order
+REVIEW_TEMPLATE = "review-echo-dot.html"
+REVIEW_SLOTS = [
+    ("Amazon Echo Dot (5th Gen) Review - Smart Speaker Analysis | TechReview Hub", "title"),
+    ("Comprehensive review of the Amazon Echo Dot (5th Gen)", "description"),
+    ("Amazon Echo Dot (5th Gen)", "name"),
+    ("Echo Dot", "name"),
+    ("$49.99", "price"),
+    ("4.8/5", "rating"),
+]
+
+BLOG_TEMPLATE = "blog-smart-home-trends-2025.html"
+BLOG_SLOTS = [
+    ("Top Smart Home Trends to Watch in 2025", "topic"),
+    ("smart home trends 2025, home automation, AI technology, IoT devices, smart home future", "keywords"),
+    ("January 2, 2025", "date"),
+]
+
+
+def review_values(product_data: Dict, rating: Optional[float] = None) -> Dict[str, str]:
+    """Slot values for a review page; the rating slot is left out until it is known"""
+    values = {
+        "title": f"{product_data['name']} Review - {product_data['category']} Analysis | TechReview Hub",
+        "description": f"Comprehensive review of the {product_data['name']}",
+        "name": product_data['name'],
+        "price": f"${product_data['price']}"
+    }
+    if rating is not None:
+        values["rating"] = f"{rating}/5"
+    return values
+
+
+def blog_values(topic: str, keywords: List[str], date: str) -> Dict[str, str]:
+    """Slot values for a blog article page"""
+    return {
+        "topic": topic,
+        "keywords": ', '.join(keywords),
+        "date": date
+    }
+
+
+class CompiledTemplate:
+    """Template split once into literal segments and named slots
+
+    Compiling applies the replacements in order, exactly like chained
+    ``str.replace`` calls on the source text, so rendering is a single join.
+    """
+
+    def __init__(self, text: str, slots: List[Tuple[str, str]]):
+        segments = [text]
+        for needle, name in slots:
+            split_segments = []
+            for segment in segments:
+                if isinstance(segment, tuple):
+                    split_segments.append(segment)
+                    continue
+                pieces = segment.split(needle)
+                for i, piece in enumerate(pieces):
+                    if i:
+                        split_segments.append((name,))
+                    split_segments.append(piece)
+            segments = split_segments
+
+        self._parts = []
+        self._slot_positions = []
+        last_is_literal = False
+        for segment in segments:
+            if isinstance(segment, tuple):
+                self._slot_positions.append((len(self._parts), segment[0]))
+                self._parts.append("")
+                last_is_literal = False
+            elif segment and last_is_literal:
+                self._parts[-1] += segment
+            elif segment:
+                self._parts.append(segment)
+                last_is_literal = True
+
+        self.slot_names = {name for _, name in self._slot_positions}
+
+    def render(self, values: Dict[str, str]) -> str:
+        """Fill every slot from ``values`` and return the page"""
+        parts = self._parts[:]
+        for position, name in self._slot_positions:
+            parts[position] = values[name]
+        return "".join(parts)
+
+    def writer(self, write: Callable[[str], object]) -> "TemplateWriter":
+        """Start an incremental render that emits output through ``write``"""
+        return TemplateWriter(self, write)
+
+
+class TemplateWriter:
+    """Incremental render of a compiled template
+
+    Each ``flush`` writes as much of the page as the known slot values allow
+    and pauses at the first slot whose value is still missing.
+    """
+
+    def __init__(self, template: CompiledTemplate, write: Callable[[str], object]):
+        self._parts = template._parts
+        self._slot_at = dict(template._slot_positions)
+        self._write = write
+        self._position = 0
+
+    @property
+    def done(self) -> bool:
+        return self._position >= len(self._parts)
+
+    def flush(self, values: Dict[str, str]) -> bool:
+        """Write every part up to the next unknown slot; returns True once the page is complete"""
+        while self._position < len(self._parts):
+            name = self._slot_at.get(self._position)
+            if name is None:
+                self._write(self._parts[self._position])
+            elif name in values:
+                self._write(values[name])
+            else:
+                return False
+            self._position += 1
+        return True
+
+
+class TemplateCache:
+    """Compiled templates keyed by path, recompiled when the file's mtime or size changes"""
+
+    def __init__(self, base_dir: str = "."):
+        self.base_dir = base_dir
+        self._templates = {}
+        self._lock = threading.Lock()
+
+    def get(self, filename: str, slots: List[Tuple[str, str]]) -> CompiledTemplate:
+        """Return the compiled template, reading the file only when it changed on disk"""
+        path = os.path.join(self.base_dir, filename)
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._templates.get(path)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        with self._lock:
+            with open(path, 'r', encoding='utf-8') as f:
+                template = CompiledTemplate(f.read(), slots)
+            self._templates[path] = (version, template)
+        return template
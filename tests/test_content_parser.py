@@ -0,0 +1,34 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from content_parser import calculate_rating, parse_sections
+
+NUMBERED_REVIEW = """## Introduction
+A compact hub for small homes.
+
+Pros:
+1. Easy setup
+2. Features a sleek design
+3. Value for money
+4. Loud speaker
+
+Cons:
+1. Design feels cheap
+2. Needs the app
+"""
+
+
+def test_numbered_items_starting_with_heading_words_stay_in_the_list():
+    sections = parse_sections(NUMBERED_REVIEW)
+    assert sections["pros"] == ["Easy setup", "Features a sleek design", "Value for money", "Loud speaker"]
+    assert sections["cons"] == ["Design feels cheap", "Needs the app"]
+    assert "design" not in sections and "value" not in sections
+    assert calculate_rating(sections["pros"], sections["cons"]) == 4.5
+
+
+def test_numbered_heading_with_colon_still_ends_the_list():
+    sections = parse_sections("Pros:\n1. Easy setup\n2. Cons:\n1. Needs the app\n")
+    assert sections["pros"] == ["Easy setup"]
+    assert sections["cons"] == ["Needs the app"]
@@ -0,0 +1,15 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from startup_check import STARTUP_BUDGETS, check_startup
+
+# Headroom for slow or busy test machines; heavy imports are never allowed
+MARGIN = 1.5
+
+
+def test_scripts_start_within_budget_without_heavy_imports():
+    budgets = {script: budget * MARGIN for script, budget in STARTUP_BUDGETS.items()}
+    assert check_startup(budgets, base_dir=ROOT) == []
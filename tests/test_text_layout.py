@@ -0,0 +1,25 @@
+import importlib.util
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Not installed anywhere, so load_font falls back to Pillow's default font
+MISSING_FACE = "no-such-font.ttf"
+
+
+@pytest.fixture
+def image_generator(tmp_path, monkeypatch):
+    pytest.importorskip("PIL")
+    # The script logs and creates images/ in the working directory
+    monkeypatch.chdir(tmp_path)
+    spec = importlib.util.spec_from_file_location("image_generator", os.path.join(ROOT, "image-generator.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_text_wrapper_matches_line_by_line_wrapping(image_generator):
+    generator = image_generator.ImageGenerator()
+    assert image_generator.check_text_layout(generator, faces=[MISSING_FACE]) == 0